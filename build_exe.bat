@@ -6,6 +6,14 @@ rmdir /s /q build
 rmdir /s /q dist
 del *.spec
 
+REM Compile the stylesheet into a Qt resource module (resources_rc.py)
+pyside6-rcc resources.qrc -o resources_rc.py
+
+REM Build the native point-in-polygon kernel if gcc is available (zone_manager falls back to NumPy)
+set PIP_BINARY=
+REM The AVX2 path is a separate object so only it is built with -mavx2; it is picked at runtime
+where gcc >nul 2>nul && gcc -O3 -ffast-math -mavx2 -mfma -c _pip_avx2.c -o _pip_avx2.o && gcc -O3 -ffast-math -fopenmp-simd -DPIP_HAVE_AVX2 -shared -o _pip.dll _pip.c _pip_avx2.o && set PIP_BINARY=--add-binary "_pip.dll;."
+
 REM Run PyInstaller
 REM --onefile: Bundles everything into a single .exe
 REM --noconsole: Hides the terminal window (optional, but good for GUI apps)
@@ -15,6 +23,9 @@ REM --add-data: Include necessary data files
 pyinstaller --noconsole --onefile --clean ^
     --name Metagros ^
     --add-data "yolov8n.pt;." ^
+    --add-data "styles;styles" ^
+    %PIP_BINARY% ^
+    --hidden-import resources_rc ^
     --hidden-import win10toast ^
     --hidden-import qtawesome ^
     --hidden-import ultralytics ^
@@ -2,16 +2,20 @@ import cv2
 import threading
 import time
 import numpy as np
+from zone_manager import get_zone_manager
 
 
 class MultiCameraManager:
     """Manages multiple camera sources for grid display (Qt-only version)."""
     
+    RING_SIZE = 3  # Frame slots per camera; get_frame views stay valid this many ticks
+    
     def __init__(self):
-        self.cameras = {}  # {id: {"cap": VideoCapture, "url": url, "last_frame": frame}}
+        self.cameras = {}  # {id: {"cap": VideoCapture, "url": url, "last_frame": frame, "frame_seq": int}}
         self.lock = threading.Lock()
         self.running = True
         self.thread = None
+        self.frame_listeners = []  # callback(cam_id, frame_seq), called from the updater thread
         
         # Start updater thread
         self.thread = threading.Thread(target=self.update_loop, daemon=True)
@@ -45,11 +49,23 @@ class MultiCameraManager:
                 "url": source,
                 "width": width,
                 "height": height,
-                "last_frame": None
+                "last_frame": None,
+                # Preallocated thumbnails the updater resizes into, reused round-robin
+                "ring": np.empty((self.RING_SIZE, height, width, 3), np.uint8),
+                "ring_pos": 0,
+                "frame_seq": 0  # Bumped on every new frame so the UI can skip repaints
             }
             
         return cam_id
 
+    def add_frame_listener(self, callback):
+        """Register callback(cam_id, frame_seq), invoked whenever a camera stores a new frame.
+        
+        Runs on the updater thread; Qt consumers should forward it through a
+        queued signal.
+        """
+        self.frame_listeners.append(callback)
+
     def remove_camera(self, cam_id):
         """Remove a camera by ID."""
         with self.lock:
@@ -61,12 +77,15 @@ class MultiCameraManager:
         """Background thread that continuously reads frames from all cameras."""
         # Lazy load detector to avoid slowing startup
         detector = None
+        zone_mgr = get_zone_manager()
         
         while self.running:
             # Get list of camera IDs (snapshot to avoid lock contention)
             with self.lock:
                 current_cams = list(self.cameras.keys())
             
+            # 1. Grab one frame from every camera
+            batch_ids, batch_frames = [], []
             for cam_id in current_cams:
                 try:
                     cam = None
@@ -80,41 +99,11 @@ class MultiCameraManager:
                     grabbed, frame = cam["cap"].read()
                     if grabbed:
                         # Resize to thumbnail size
-                        frame = cv2.resize(frame, (cam["width"], cam["height"]))
-                        
-                        # Run YOLO detection (lazy load)
-                        detections = []
-                        try:
-                            if detector is None:
-                                print("[MultiCamera] Loading YOLO detector...")
-                                from object_detector import get_detector
-                                detector = get_detector()
-                                if detector and detector.model:
-                                    print("[MultiCamera] YOLO detector ready!")
-                                else:
-                                    print("[MultiCamera] YOLO detector failed to load model")
-                            
-                            if detector and detector.model:
-                                detections = detector.detect(frame)
-                                if detections:
-                                    print(f"[MultiCamera] Detected: {[d['class'] for d in detections]}")
-                                frame = detector.draw_boxes(frame, detections)
-                        except Exception as e:
-                            print(f"[MultiCamera] Detection error: {e}")
-                        
-                        # Draw restricted zones on frame
-                        try:
-                            from zone_manager import get_zone_manager
-                            zone_mgr = get_zone_manager()
-                            frame = zone_mgr.draw_zones(frame)
-                        except:
-                            pass  # Zone drawing is optional
-                        
-                        # Store frame and detections for Qt consumption
-                        with self.lock:
-                            if cam_id in self.cameras:
-                                self.cameras[cam_id]["last_frame"] = frame
-                                self.cameras[cam_id]["detections"] = detections
+                        batch_ids.append(cam_id)
+                        pos = cam["ring_pos"]
+                        cam["ring_pos"] = (pos + 1) % self.RING_SIZE
+                        batch_frames.append(cv2.resize(frame, (cam["width"], cam["height"]),
+                                                       dst=cam["ring"][pos]))
                     else:
                         # Loop video files
                         if not str(cam["url"]).isdigit():
@@ -123,15 +112,74 @@ class MultiCameraManager:
                 except Exception as e:
                     print(f"Camera {cam_id} error: {e}")
             
+            if not batch_frames:
+                time.sleep(0.05)
+                continue
+            
+            # 2. Run YOLO detection once for the whole batch (lazy load)
+            batch_detections = [[] for _ in batch_frames]
+            try:
+                if detector is None:
+                    print("[MultiCamera] Loading YOLO detector...")
+                    from object_detector import get_detector
+                    detector = get_detector()
+                    if detector and detector.model:
+                        print("[MultiCamera] YOLO detector ready!")
+                    else:
+                        print("[MultiCamera] YOLO detector failed to load model")
+                
+                if detector and detector.model:
+                    batch_detections = detector.detect_batch(batch_frames)
+            except Exception as e:
+                print(f"[MultiCamera] Detection error: {e}")
+            
+            # 3. Annotate and publish each camera's frame
+            for cam_id, frame, detections in zip(batch_ids, batch_frames, batch_detections):
+                try:
+                    if detections:
+                        print(f"[MultiCamera] Detected: {[d['class'] for d in detections]}")
+                        frame = detector.draw_boxes(frame, detections)
+                    
+                    # Draw restricted zones on frame
+                    try:
+                        frame = zone_mgr.draw_zones(frame)
+                    except:
+                        pass  # Zone drawing is optional
+                    
+                    # Store frame and detections for Qt consumption
+                    seq = None
+                    with self.lock:
+                        if cam_id in self.cameras:
+                            self.cameras[cam_id]["last_frame"] = frame
+                            self.cameras[cam_id]["detections"] = detections
+                            self.cameras[cam_id]["frame_seq"] += 1
+                            seq = self.cameras[cam_id]["frame_seq"]
+                    
+                    # Notify consumers outside the lock
+                    if seq is not None:
+                        for listener in self.frame_listeners:
+                            listener(cam_id, seq)
+                except Exception as e:
+                    print(f"Camera {cam_id} error: {e}")
+            
             time.sleep(0.05)  # ~20 FPS (slightly slower to allow detection)
 
     def get_frame(self, cam_id):
-        """Get the latest frame for a camera (thread-safe)."""
+        """Get the latest frame for a camera (thread-safe, no copy).
+        
+        Returns a view into the camera's frame ring. Treat it as read-only and
+        use it right away: the slot is overwritten RING_SIZE ticks later, so
+        copy it if it has to be kept.
+        """
+        cam = self.cameras.get(cam_id)  # Single dict read, atomic under the GIL
+        return cam["last_frame"] if cam is not None else None
+
+    def get_frame_seq(self, cam_id):
+        """Get the sequence number of the latest frame (0 if none yet)."""
         with self.lock:
             if cam_id in self.cameras:
-                frame = self.cameras[cam_id].get("last_frame")
-                return frame.copy() if frame is not None else None
-        return None
+                return self.cameras[cam_id]["frame_seq"]
+        return 0
 
     def stop(self):
         """Stop all cameras and the update thread."""
@@ -7,6 +7,7 @@ Tracks individuals across frames and detects loitering behavior
 
 import time
 import math
+from bisect import bisect_right
 from collections import defaultdict
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
@@ -26,9 +27,15 @@ class TrackedPerson:
         self.positions.append((x, y, now))
         self.last_seen = now
         
-        # Keep only last 60 seconds of history
-        cutoff = now - 60
-        self.positions = [(px, py, pt) for px, py, pt in self.positions if pt > cutoff]
+        # Keep only last 60 seconds of history (positions are in time order,
+        # so the expired ones are a prefix)
+        stale = self._window_start(now - 60)
+        if stale:
+            del self.positions[:stale]
+    
+    def _window_start(self, cutoff: float) -> int:
+        """Index of the first position newer than cutoff (binary search)."""
+        return bisect_right(self.positions, cutoff, key=lambda p: p[2])
     
     def get_center(self) -> Tuple[float, float]:
         """Get current center position."""
@@ -44,36 +51,26 @@ class TrackedPerson:
         if len(self.positions) < 2:
             return 0.0
         
-        now = time.time()
-        cutoff = now - seconds
-        recent = [(x, y) for x, y, t in self.positions if t > cutoff]
+        recent = self.positions[self._window_start(time.time() - seconds):]
         
         if len(recent) < 2:
             return 0.0
         
         # Calculate total distance traveled
-        total_dist = 0.0
-        for i in range(1, len(recent)):
-            dx = recent[i][0] - recent[i-1][0]
-            dy = recent[i][1] - recent[i-1][1]
-            total_dist += math.sqrt(dx*dx + dy*dy)
-        
-        return total_dist
+        return sum(math.hypot(x1 - x0, y1 - y0)
+                   for (x0, y0, _), (x1, y1, _) in zip(recent, recent[1:]))
     
     def get_bounding_box_size(self, seconds: float = 30.0) -> float:
         """
         Calculate the bounding box of positions over time.
         Small box = stayed in same area = loitering.
         """
-        now = time.time()
-        cutoff = now - seconds
-        recent = [(x, y) for x, y, t in self.positions if t > cutoff]
+        recent = self.positions[self._window_start(time.time() - seconds):]
         
         if len(recent) < 5:  # Need enough data points
             return float('inf')
         
-        xs = [p[0] for p in recent]
-        ys = [p[1] for p in recent]
+        xs, ys, _ = zip(*recent)
         
         width = max(xs) - min(xs)
         height = max(ys) - min(ys)
@@ -146,7 +143,7 @@ class PersonTracker:
             for i, (cx, cy, det) in enumerate(centroids):
                 if i in used_detections:
                     continue
-                dist = math.sqrt((tx - cx)**2 + (ty - cy)**2)
+                dist = math.hypot(tx - cx, ty - cy)
                 if dist < best_dist and dist < self.max_distance:
                     best_dist = dist
                     best_idx = i
@@ -269,7 +266,7 @@ class VehicleTracker:
             for i, (cx, cy, det) in enumerate(centroids):
                 if i in used_detections:
                     continue
-                dist = math.sqrt((tx - cx)**2 + (ty - cy)**2)
+                dist = math.hypot(tx - cx, ty - cy)
                 if dist < best_dist and dist < self.max_distance:
                     best_dist = dist
                     best_idx = i
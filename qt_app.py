@@ -12,7 +12,13 @@ import json
 import cv2
 import numpy as np
 import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QLabel, QPushButton, QFileDialog, QSlider, QListWidget, QListWidgetItem, 
@@ -20,8 +26,8 @@ from PySide6.QtWidgets import (
     QComboBox, QGroupBox, QTableWidget, QTableWidgetItem, QCheckBox,
     QHeaderView, QSplitter, QSpinBox, QMessageBox, QDialog, QFrame, QFormLayout
 )
-from PySide6.QtCore import Qt, QTimer, QUrl, QThread, Signal
-from PySide6.QtGui import QImage, QPixmap, QIcon
+from PySide6.QtCore import Qt, QTimer, QUrl, QThread, Signal, QFile
+from PySide6.QtGui import QImage, QPixmap, QIcon, QPainter
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 import qtawesome as qta
 
@@ -31,17 +37,51 @@ from face_handler import FaceHandler
 from data_manager import DataManager
 from multi_camera import MultiCameraManager
 from incident_workflow import IncidentType, IncidentWorkflow, EvidenceClip
+from zone_manager import get_zone_manager
+from rtstream_monitor import RTStreamMonitor, StreamConfig, DetectionScenario, get_scenario_prompt
 
 # Twelve Labs API key
 TWELVE_LABS_API_KEY = os.getenv("TWELVE_LABS_API_KEY", "")
 
+# Timestamp formats (event log / exported file names)
+TIME_FMT = "%H:%M:%S"
+FILE_TS_FMT = "%Y%m%d_%H%M%S"
+
+_last_ts = (-1, "")  # (epoch second, formatted TIME_FMT), swapped as one tuple
+
+
+_ICON_CACHE = {}  # (name, options) -> QIcon, shared across window rebuilds (logout/login)
+
+
+def _icon(name: str, **options) -> QIcon:
+    """qtawesome icon, rendered once per (name, options) and reused."""
+    key = (name, tuple(sorted(options.items())))
+    icon = _ICON_CACHE.get(key)
+    if icon is None:
+        icon = _ICON_CACHE[key] = qta.icon(name, **options)
+    return icon
+
+
+def _fast_ts() -> str:
+    """Current time as TIME_FMT, formatted at most once per wall-clock second."""
+    global _last_ts
+    now = int(time.time())
+    sec, text = _last_ts
+    if now != sec:
+        text = time.strftime(TIME_FMT, time.localtime(now))
+        _last_ts = (now, text)
+    return text
+
 
 def convert_cv_qt(cv_img):
-    """Convert BGR opencv image to QPixmap"""
-    rgb_image = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-    h, w, ch = rgb_image.shape
-    bytes_per_line = ch * w
-    qt_img = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888).copy()
+    """Convert BGR opencv image to QPixmap.
+    
+    Qt reads BGR directly (Format_BGR888), so no colour-swapped copy is made.
+    """
+    cv_img = np.ascontiguousarray(cv_img)
+    h, w, ch = cv_img.shape
+    # QPixmap.fromImage copies the pixels, so the QImage can view cv_img directly
+    qt_img = QImage(cv_img.data, w, h, cv_img.strides[0], QImage.Format_BGR888)
     return QPixmap.fromImage(qt_img)
 
 
@@ -55,6 +95,31 @@ def draw_faces_on_frame(frame, face_locations, face_names):
     return frame
 
 
+# ==================== STYLESHEET ====================
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles", "dark.qss")
+
+
+def load_stylesheet() -> str:
+    """Read the app theme, preferring the compiled Qt resource (resources_rc).
+    
+    Applied once to the QApplication at startup so Qt parses it a single time
+    for every MainWindow/LoginDialog (logout -> login). Falls back to the
+    .qss file next to this module when resources_rc hasn't been generated.
+    """
+    try:
+        import resources_rc  # noqa: F401 - registers :/styles/dark.qss
+        qss = QFile(":/styles/dark.qss")
+        if qss.open(QFile.ReadOnly | QFile.Text):
+            try:
+                return bytes(qss.readAll()).decode("utf-8")
+            finally:
+                qss.close()
+    except ImportError:
+        pass
+    with open(STYLESHEET_PATH, encoding="utf-8") as f:
+        return f.read()
+
+
 # ==================== LIVE TAB ====================
 class LiveTab(QWidget):
     def __init__(self, face_handler, data_manager):
@@ -165,10 +230,10 @@ class IncidentDetectionWorker(QThread):
     
     def run(self):
         try:
-            from twelvelabs_client import TwelveLabsClient
+            from twelvelabs_client import get_client
             
             self.status_update.emit("Initializing...")
-            client = TwelveLabsClient(api_key=self.api_key)
+            client = get_client(self.api_key)
             
             workflow = IncidentWorkflow(sensitivity=self.sensitivity)
             queries = workflow.get_queries(self.incident_type, self.custom_query)
@@ -204,10 +269,10 @@ class CustomSearchWorker(QThread):
     
     def run(self):
         try:
-            from twelvelabs_client import TwelveLabsClient
+            from twelvelabs_client import get_client
             
             self.status_update.emit(f"Analyzing: {self.query[:40]}...")
-            client = TwelveLabsClient(api_key=self.api_key)
+            client = get_client(self.api_key)
             
             # Use search_moments with the single custom query
             moments = client.search_moments(self.query, top_k=10)
@@ -259,7 +324,7 @@ class VideoAnalysisTab(QWidget):
         # File controls
         file_row = QHBoxLayout()
         self.btn_open = QPushButton(" Open Video")
-        self.btn_open.setIcon(qta.icon('fa5s.folder-open'))
+        self.btn_open.setIcon(_icon('fa5s.folder-open'))
         self.btn_open.clicked.connect(self.open_file)
         file_row.addWidget(self.btn_open)
         
@@ -268,7 +333,7 @@ class VideoAnalysisTab(QWidget):
         file_row.addWidget(self.file_label, stretch=1)
         
         self.btn_upload = QPushButton("Index with Twelvelabs")
-        self.btn_upload.setIcon(qta.icon('fa5s.database'))
+        self.btn_upload.setIcon(_icon('fa5s.database'))
         self.btn_upload.clicked.connect(self.upload_video)
         self.btn_upload.setEnabled(False)
         file_row.addWidget(self.btn_upload)
@@ -361,7 +426,7 @@ class VideoAnalysisTab(QWidget):
         
         # Detect Button (uses incident type + custom query)
         self.btn_detect = QPushButton("Detect Incidents")
-        self.btn_detect.setIcon(qta.icon('fa5s.search-plus', color='white', color_disabled='white'))
+        self.btn_detect.setIcon(_icon('fa5s.search-plus', color='white', color_disabled='white'))
         self.btn_detect.setStyleSheet("background-color: #2196F3; color: white; font-weight: bold; padding: 10px;")
         self.btn_detect.clicked.connect(self.detect_incidents)
         self.btn_detect.setEnabled(False)
@@ -369,7 +434,7 @@ class VideoAnalysisTab(QWidget):
         
         # Custom Search Button (uses only custom query)
         self.btn_custom_search = QPushButton("Custom Search")
-        self.btn_custom_search.setIcon(qta.icon('fa5s.search', color='white', color_disabled='white'))
+        self.btn_custom_search.setIcon(_icon('fa5s.search', color='white', color_disabled='white'))
         self.btn_custom_search.setStyleSheet("background-color: #9C27B0; color: white; font-weight: bold; padding: 10px;")
         self.btn_custom_search.clicked.connect(self.custom_search)
         self.btn_custom_search.setEnabled(False)
@@ -395,7 +460,7 @@ class VideoAnalysisTab(QWidget):
         # Jump button
         btn_row = QHBoxLayout()
         self.btn_jump = QPushButton("Jump to Selected")
-        self.btn_jump.setIcon(qta.icon('fa5s.forward'))
+        self.btn_jump.setIcon(_icon('fa5s.forward'))
         self.btn_jump.clicked.connect(self.jump_to_selected)
         btn_row.addWidget(self.btn_jump)
         btn_row.addStretch()
@@ -409,19 +474,19 @@ class VideoAnalysisTab(QWidget):
         actions_layout = QHBoxLayout()
         
         self.btn_generate = QPushButton("Generate Report")
-        self.btn_generate.setIcon(qta.icon('fa5s.file-alt', color='white', color_disabled='white'))
+        self.btn_generate.setIcon(_icon('fa5s.file-alt', color='white', color_disabled='white'))
         self.btn_generate.clicked.connect(self.generate_report)
         self.btn_generate.setEnabled(False)
         actions_layout.addWidget(self.btn_generate)
         
         self.btn_export_json = QPushButton("Export JSON")
-        self.btn_export_json.setIcon(qta.icon('fa5s.save', color='white', color_disabled='white'))
+        self.btn_export_json.setIcon(_icon('fa5s.save', color='white', color_disabled='white'))
         self.btn_export_json.clicked.connect(self.export_json)
         self.btn_export_json.setEnabled(False)
         actions_layout.addWidget(self.btn_export_json)
         
         self.btn_export_pdf = QPushButton("Export PDF")
-        self.btn_export_pdf.setIcon(qta.icon('fa5s.file-pdf', color='white', color_disabled='white'))
+        self.btn_export_pdf.setIcon(_icon('fa5s.file-pdf', color='white', color_disabled='white'))
         self.btn_export_pdf.setStyleSheet("background-color: #D32F2F; color: white;")
         self.btn_export_pdf.clicked.connect(self.export_pdf)
         self.btn_export_pdf.setEnabled(False)
@@ -581,7 +646,7 @@ class VideoAnalysisTab(QWidget):
         self.btn_detect.setEnabled(True)
         self.btn_custom_search.setEnabled(True)
         self.btn_upload.setText("Video Indexed")
-        self.btn_upload.setIcon(qta.icon('fa5s.check'))
+        self.btn_upload.setIcon(_icon('fa5s.check'))
     
     def on_status_update(self, status: str):
         self.status_label.setText(status)
@@ -778,7 +843,7 @@ class VideoAnalysisTab(QWidget):
         
         filename, _ = QFileDialog.getSaveFileName(
             self, "Export Report", 
-            f"incident_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            f"incident_report_{datetime.now().strftime(FILE_TS_FMT)}.json",
             "JSON Files (*.json)"
         )
         
@@ -794,7 +859,7 @@ class VideoAnalysisTab(QWidget):
         
         filename, _ = QFileDialog.getSaveFileName(
             self, "Export PDF Report", 
-            f"incident_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+            f"incident_report_{datetime.now().strftime(FILE_TS_FMT)}.pdf",
             "PDF Files (*.pdf)"
         )
         
@@ -821,9 +886,9 @@ class UploadWorker(QThread):
     
     def run(self):
         try:
-            from twelvelabs_client import TwelveLabsClient
+            from twelvelabs_client import get_client
             
-            client = TwelveLabsClient(api_key=self.api_key)
+            client = get_client(self.api_key)
             
             asset_id = client.upload_and_index_video(
                 self.file_path,
@@ -836,211 +901,46 @@ class UploadWorker(QThread):
             self.error.emit(str(e))
 
 
-# ==================== GRID TAB ====================
-class GridTab(QWidget):
-    """CCTV Grid with AI-Powered Real-Time Monitoring."""
+class ConnectStreamWorker(QThread):
+    """Background worker for connecting an RTSP stream to VideoDB."""
+    connected = Signal(object, str)  # (RTStreamMonitor, stream_id)
+    error = Signal(str)
     
-    def __init__(self, multi_cam):
+    def __init__(self, monitor, api_key: str, config: StreamConfig):
         super().__init__()
-        self.multi_cam = multi_cam
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_grid)
-        self.timer.start(100)
-        self.grid_widgets = {}
-        
-        # RTStream state
-        self.rtstream_monitor = None
-        self.current_stream_id = None
-        self.current_index_id = None
-        
-        self.init_ui()
-
-    def init_ui(self):
-        main_layout = QHBoxLayout()
-        
-        # LEFT PANEL: Controls
-        controls = QVBoxLayout()
-        
-        # Camera Section
-        controls.addWidget(QLabel("<b>📹 CCTV Controls</b>"))
-        
-        self.cam_input = QLineEdit()
-        self.cam_input.setPlaceholderText("RTSP URL or camera ID")
-        controls.addWidget(self.cam_input)
-        
-        cam_btn_row = QHBoxLayout()
-        self.btn_add = QPushButton("Add Camera")
-        self.btn_add.clicked.connect(self.add_camera)
-        cam_btn_row.addWidget(self.btn_add)
-        
-        self.btn_add_webcam = QPushButton("📷 Webcam")
-        self.btn_add_webcam.setStyleSheet("background-color: #4CAF50;")
-        self.btn_add_webcam.clicked.connect(self.add_webcam)
-        cam_btn_row.addWidget(self.btn_add_webcam)
-        
-        self.btn_remove = QPushButton("Remove")
-        self.btn_remove.clicked.connect(self.remove_camera)
-        cam_btn_row.addWidget(self.btn_remove)
-        controls.addLayout(cam_btn_row)
-        
-        self.cam_list = QListWidget()
-        self.cam_list.setMaximumHeight(100)
-        controls.addWidget(self.cam_list)
-        
-        # AI Monitoring Section
-        controls.addWidget(QLabel(""))  # Spacer
-        controls.addWidget(QLabel("<b>🤖 AI Monitoring (VideoDB)</b>"))
-        
-        # Scenario dropdown
-        self.scenario_combo = QComboBox()
-        from rtstream_monitor import DetectionScenario, get_scenario_prompt
-        for scenario in DetectionScenario:
-            self.scenario_combo.addItem(scenario.value, scenario)
-        self.scenario_combo.currentIndexChanged.connect(self.on_scenario_changed)
-        controls.addWidget(self.scenario_combo)
-        
-        # Custom prompt
-        controls.addWidget(QLabel("Detection Prompt:"))
-        self.prompt_edit = QTextEdit()
-        self.prompt_edit.setMaximumHeight(80)
-        self.prompt_edit.setPlaceholderText("AI will monitor for this...")
-        # Set initial prompt
-        self.on_scenario_changed(0)
-        controls.addWidget(self.prompt_edit)
-        
-        # Stream source for monitoring (VideoDB needs RTSP)
-        controls.addWidget(QLabel("Stream Source:"))
-        self.stream_combo = QComboBox()
-        self.stream_combo.setEditable(True)
-        self.stream_combo.addItems([
-            "rtsp://samples.rts.videodb.io:8554/floods",
-            "Webcam (local only)",
-            "Custom RTSP URL..."
-        ])
-        controls.addWidget(self.stream_combo)
-        
-        # Note about VideoDB
-        note = QLabel("⚠️ AI monitoring requires RTSP stream")
-        note.setStyleSheet("color: #888; font-size: 10px;")
-        controls.addWidget(note)
-        
-        # Webhook URL (optional)
-        self.webhook_input = QLineEdit()
-        self.webhook_input.setPlaceholderText("Webhook URL for alerts (optional)")
-        controls.addWidget(self.webhook_input)
-        
-        # Control buttons
-        monitor_btn_row = QHBoxLayout()
-        self.btn_connect = QPushButton("🔗 Connect Stream")
-        self.btn_connect.clicked.connect(self.connect_stream)
-        monitor_btn_row.addWidget(self.btn_connect)
-        
-        self.btn_start_monitor = QPushButton("▶ Start Monitoring")
-        self.btn_start_monitor.clicked.connect(self.start_monitoring)
-        self.btn_start_monitor.setEnabled(False)
-        monitor_btn_row.addWidget(self.btn_start_monitor)
-        controls.addLayout(monitor_btn_row)
-        
-        self.btn_stop_monitor = QPushButton("⏹ Stop Monitoring")
-        self.btn_stop_monitor.clicked.connect(self.stop_monitoring)
-        self.btn_stop_monitor.setEnabled(False)
-        controls.addWidget(self.btn_stop_monitor)
-        
-        # Status
-        self.monitor_status = QLabel("Not connected")
-        self.monitor_status.setStyleSheet("color: #888;")
-        controls.addWidget(self.monitor_status)
-        
-        controls.addStretch()
-        main_layout.addLayout(controls, stretch=1)
-        
-        # RIGHT PANEL: Grid + Event Log
-        right_panel = QVBoxLayout()
-        
-        # Camera Grid
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.grid_container = QWidget()
-        self.grid_layout = QGridLayout()
-        self.grid_container.setLayout(self.grid_layout)
-        scroll.setWidget(self.grid_container)
-        right_panel.addWidget(scroll, stretch=2)
-        
-        # Event Log
-        right_panel.addWidget(QLabel("<b>📋 Detected Events</b>"))
-        self.event_log = QTextEdit()
-        self.event_log.setReadOnly(True)
-        self.event_log.setMaximumHeight(150)
-        self.event_log.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #4CAF50;
-                font-family: Consolas, monospace;
-                font-size: 11px;
-            }
-        """)
-        right_panel.addWidget(self.event_log)
-        
-        # Refresh events button
-        self.btn_refresh_events = QPushButton("🔄 Refresh Events")
-        self.btn_refresh_events.clicked.connect(self.refresh_events)
-        self.btn_refresh_events.setEnabled(False)
-        right_panel.addWidget(self.btn_refresh_events)
-        
-        main_layout.addLayout(right_panel, stretch=3)
-        self.setLayout(main_layout)
-    
-    def on_scenario_changed(self, index):
-        """Update prompt when scenario changes."""
-        from rtstream_monitor import get_scenario_prompt
-        scenario = self.scenario_combo.currentData()
-        if scenario:
-            self.prompt_edit.setText(get_scenario_prompt(scenario))
+        self.monitor = monitor  # Reused if already created, else built here
+        self.api_key = api_key
+        self.config = config
     
-    def connect_stream(self):
-        """Connect to RTSP stream via VideoDB."""
-        rtsp_url = self.stream_combo.currentText().strip()
-        
-        # Handle special cases
-        if "Webcam" in rtsp_url or rtsp_url == "Webcam (local only)":
-            self.monitor_status.setText("⚠️ Webcam requires RTSP - use CCTV Grid")
-            return
-        if "Custom" in rtsp_url or not rtsp_url:
-            self.monitor_status.setText("⚠️ Enter a valid RTSP URL")
-            return
-        
-        self.monitor_status.setText("Connecting...")
-        
+    def run(self):
         try:
-            from rtstream_monitor import RTStreamMonitor, StreamConfig, DetectionScenario
-            
-            # Initialize monitor if needed
-            if not self.rtstream_monitor:
-                self.rtstream_monitor = RTStreamMonitor(
-                    api_key="sk-idjvWUi2BhlxJnCKaHFUIaKmrdFLWteLPb2OqHmNjzY"
-                )
-            
-            scenario = self.scenario_combo.currentData() or DetectionScenario.CUSTOM
-            config = StreamConfig(
-                name=f"{scenario.value} Monitor",
-                rtsp_url=rtsp_url,
-                scenario=scenario,
-                custom_prompt=self.prompt_edit.toPlainText()
-            )
+            if self.monitor is None:
+                self.monitor = RTStreamMonitor(api_key=self.api_key)
             
-            self.current_stream_id = self.rtstream_monitor.connect_stream(config)
-            self.monitor_status.setText(f"✅ Connected: {self.current_stream_id[:20]}...")
-            self.btn_start_monitor.setEnabled(True)
-            self.btn_connect.setEnabled(False)
+            stream_id = self.monitor.connect_stream(self.config)
+            self.connected.emit(self.monitor, stream_id)
             
         except Exception as e:
-            self.monitor_status.setText(f"❌ Error: {str(e)[:50]}")
+            self.error.emit(str(e))
+
+
+class RecentScenesWorker(QThread):
+    """Background worker for fetching newly indexed RTStream scenes."""
+    scenes_ready = Signal(list)
+    error = Signal(str)
     
-    def start_monitoring(self):
-        """Start AI monitoring on the connected stream."""
-        if not self.current_stream_id:
-            return
-        
+    def __init__(self, monitor, index_id: str):
+        super().__init__()
+        self.monitor = monitor
+        self.index_id = index_id
+    
+    def run(self):
+        try:
+            self.scenes_ready.emit(self.monitor.get_new_scenes(self.index_id))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 # ==================== LOCAL AI WORKER (YOLO-powered) ====================
 class DeepAnalyzeWorker(QThread):
     """Captures frames from the existing multi-camera and sends to Twelve Labs."""
@@ -1058,7 +958,7 @@ class DeepAnalyzeWorker(QThread):
         import tempfile
         import os
         import time
-        from twelvelabs_client import TwelveLabsClient
+        from twelvelabs_client import get_client
 
         try:
             # 1. Capture Video from EXISTING multi_cam (no new webcam!)
@@ -1110,7 +1010,7 @@ class DeepAnalyzeWorker(QThread):
             
             # 2. Upload & Analyze
             self.status_update.emit("Uploading to Twelve Labs...")
-            client = TwelveLabsClient(self.api_key)
+            client = get_client(self.api_key)
             
             self.status_update.emit("AI Analysis in progress...")
             analysis = client.analyze_video(temp_path, "Describe the situation, potential threats, and activities in detail.")
@@ -1128,18 +1028,34 @@ class DeepAnalyzeWorker(QThread):
 
 
 
+# Grid side length by camera count: ceil(sqrt(count)), minimum 2x2
+_GRID_COLS = tuple(max(2, math.isqrt(n - 1) + 1) if n else 2 for n in range(26))
+
+
+def _grid_cols(count: int) -> int:
+    """Columns (= rows) of the square camera grid for count cameras."""
+    if count < len(_GRID_COLS):
+        return _GRID_COLS[count]
+    return math.isqrt(count - 1) + 1
+
+
 class ClickableCameraWidget(QLabel):
     """Custom Label that emits clicked signal."""
     clicked = Signal(str)  # Emits cam_id
+    
+    # Shared stylesheet strings (instances may override default_style)
+    default_style = "background-color: #1a1a1a; border: 2px solid #333;"
+    selected_style = "background-color: #1a1a1a; border: 3px solid #00E676;" # High-vis green
 
     def __init__(self, cam_id, text="", parent=None):
         super().__init__(text, parent)
         self.cam_id = cam_id
         self.selected = False
+        self.last_seq = 0  # Sequence number of the frame currently displayed
+        self.frame_size = (0, 0)  # (w, h) of the drawable area, kept current by resizeEvent
+        self._image = None  # QImage painted over the contents rect (see set_image)
         self.setAlignment(Qt.AlignCenter)
         self.setMouseTracking(True)
-        self.default_style = "background-color: #1a1a1a; border: 2px solid #333;"
-        self.selected_style = "background-color: #1a1a1a; border: 3px solid #00E676;" # High-vis green
         self.setStyleSheet(self.default_style)
 
     def mousePressEvent(self, event):
@@ -1147,28 +1063,99 @@ class ClickableCameraWidget(QLabel):
             self.clicked.emit(self.cam_id)
         super().mousePressEvent(event)
 
+    def resizeEvent(self, event):
+        rect = self.contentsRect()
+        self.frame_size = (rect.width(), rect.height())
+        super().resizeEvent(event)
+
+    def set_image(self, image: QImage):
+        """Show a frame. The image is painted directly, so it must stay alive and unchanged until repainted."""
+        if self._image is None:
+            self.clear()  # Drop the "Loading..." text
+        self._image = image
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)  # Stylesheet background/border
+        if self._image is not None:
+            painter = QPainter(self)
+            painter.drawImage(self.contentsRect(), self._image)
+            painter.end()
+
     def set_selected(self, selected: bool):
         self.selected = selected
         self.setStyleSheet(self.selected_style if selected else self.default_style)
 
 
+@dataclass(slots=True)
+class Rule:
+    """A local AI detection rule evaluated by LocalAIWorker."""
+    id: int
+    scenario: str
+    prompt: str
+    enabled: bool = True
+    # Derived once here so the worker doesn't redo them every tick
+    prompt_lower: str = field(init=False)
+    crowd_threshold: int = field(init=False)
+    # Which of the worker's checks this rule takes part in
+    is_person_loiter: bool = field(init=False)
+    is_vehicle_loiter: bool = field(init=False)
+    is_crowd: bool = field(init=False)
+    is_zone: bool = field(init=False)
+    is_behavior: bool = field(init=False)  # Skipped by plain class matching
+    
+    def __post_init__(self):
+        prompt = self.prompt_lower = self.prompt.lower()
+        count_match = re.search(r'\b(\d+)\b', prompt)
+        self.crowd_threshold = int(count_match.group(1)) if count_match else 3
+        
+        loiter = 'loiter' in prompt or 'stay' in prompt or 'remain' in prompt or 'linger' in prompt
+        vehicle = 'vehicle' in prompt or 'car' in prompt
+        self.is_person_loiter = loiter and not vehicle
+        self.is_vehicle_loiter = ((vehicle or 'parked' in prompt)
+                                  and ('loiter' in prompt or 'stay' in prompt or 'parked' in prompt))
+        self.is_crowd = 'crowd' in prompt or 'gathering' in prompt or 'group' in prompt
+        self.is_zone = 'zone' in prompt or 'intrusion' in prompt or 'restricted' in prompt
+        self.is_behavior = ('loiter' in prompt or 'stay' in prompt or 'remain' in prompt
+                            or 'crowd' in prompt or 'gathering' in prompt)
+
+
+@dataclass(slots=True, frozen=True)
+class DetectionEvent:
+    """A single alert raised by LocalAIWorker."""
+    description: str
+    timestamp: str
+    rule_id: int
+    event_type: str
+    class_name: Optional[str] = None
+    confidence: Optional[float] = None
+
+
 class LocalAIWorker(QThread):
     """Uses YOLO detections for real-time object-based rule matching + behavior detection."""
-    event_detected = Signal(dict)
+    event_detected = Signal(object)  # DetectionEvent
+    
+    ALERT_DEBOUNCE_SECONDS = 60.0  # Don't repeat the same rule/class alert within this window
+    ALERT_CACHE_SIZE = 512
     
     def __init__(self, multi_cam, rules):
         super().__init__()
         self.multi_cam = multi_cam
-        self.rules = rules  # List of {id, scenario, prompt, enabled}
+        self.rules = rules  # List of Rule
         self.running = True
-        self.last_detections = set()  # Track to avoid duplicate alerts
+        self._stop = threading.Event()  # Wakes the pacing wait immediately on stop()
+        self.last_detections = OrderedDict()  # (rule_id, class) -> alert time, oldest first
         self.tracker = None  # Person tracker
         self.vehicle_tracker = None  # Vehicle tracker
         self.crowd_alerted = False  # One-shot crowd alert
+        self._tick_ts = None  # Timestamp shared by all events of the current tick
+        self._match_cache = {}  # (rule_id, class) -> prompt matches class
+        try:
+            self._zone_mgr = get_zone_manager()
+        except Exception:
+            self._zone_mgr = None  # Zone detection is optional
         
     def run(self):
-        import time
-        
         # Initialize trackers
         from person_tracker import PersonTracker, VehicleTracker
         self.tracker = PersonTracker(
@@ -1181,10 +1168,10 @@ class LocalAIWorker(QThread):
         )
         
         while self.running:
-            time.sleep(0.5)  # Check twice per second for tracking accuracy
-            
-            if not self.running:
+            # Check twice per second for tracking accuracy; returns early on stop()
+            if self._stop.wait(0.5):
                 break
+            self._tick_ts = None
             
             # Get detections from camera
             detections = []
@@ -1198,105 +1185,125 @@ class LocalAIWorker(QThread):
             tracked_persons = self.tracker.update(detections)
             tracked_vehicles = self.vehicle_tracker.update(detections)
             
-            # Count persons for crowd detection
-            person_count = len([d for d in detections if d['class'] == 'person'])
+            # Single pass over the detections shared by every rule below:
+            # person count plus the first detection of each class
+            person_count = 0
+            first_by_class = {}
+            for det in detections:
+                class_name = det['class']
+                if class_name == 'person':
+                    person_count += 1
+                if class_name not in first_by_class:
+                    first_by_class[class_name] = det['confidence']
+            
+            rules = self.rules
             
             # ========== PERSON LOITERING ==========
             for person in tracked_persons:
                 if person['is_loitering'] and not person['loitering_alerted']:
-                    for rule in self.rules:
-                        prompt = rule['prompt'].lower()
-                        if 'loiter' in prompt or 'stay' in prompt or 'remain' in prompt or 'linger' in prompt:
-                            if 'vehicle' not in prompt and 'car' not in prompt:
-                                msg = f"⚠️ [{rule['scenario']}] LOITERING: Person #{person['id']} in same area for {person['time_tracked']:.0f}s"
-                                self._emit_event(msg, rule['id'], "loitering_person")
-                                break
+                    for rule in rules:
+                        if rule.is_person_loiter:
+                            msg = f"⚠️ [{rule.scenario}] LOITERING: Person #{person['id']} in same area for {person['time_tracked']:.0f}s"
+                            self._emit_event(msg, rule.id, "loitering_person")
+                            break
             
             # ========== VEHICLE LOITERING ==========
             for vehicle in tracked_vehicles:
                 if vehicle['is_loitering'] and not vehicle['loitering_alerted']:
-                    for rule in self.rules:
-                        prompt = rule['prompt'].lower()
-                        if ('vehicle' in prompt or 'car' in prompt or 'parked' in prompt) and ('loiter' in prompt or 'stay' in prompt or 'parked' in prompt):
-                            msg = f"🚗 [{rule['scenario']}] PARKED VEHICLE: Vehicle #{vehicle['id']} stationary for {vehicle['time_tracked']:.0f}s"
-                            self._emit_event(msg, rule['id'], "loitering_vehicle")
+                    for rule in rules:
+                        if rule.is_vehicle_loiter:
+                            msg = f"🚗 [{rule.scenario}] PARKED VEHICLE: Vehicle #{vehicle['id']} stationary for {vehicle['time_tracked']:.0f}s"
+                            self._emit_event(msg, rule.id, "loitering_vehicle")
                             break
             
             # ========== CROWD DETECTION ==========
-            for rule in self.rules:
-                prompt = rule['prompt'].lower()
-                if 'crowd' in prompt or 'gathering' in prompt or 'group' in prompt:
-                    # Extract threshold from prompt or default to 3
-                    threshold = 3
+            for rule in rules:
+                if rule.is_crowd:
+                    threshold = rule.crowd_threshold
                     if person_count >= threshold and not self.crowd_alerted:
-                        msg = f"👥 [{rule['scenario']}] CROWD ALERT: {person_count} people detected"
-                        self._emit_event(msg, rule['id'], "crowd")
+                        msg = f"👥 [{rule.scenario}] CROWD ALERT: {person_count} people detected"
+                        self._emit_event(msg, rule.id, "crowd")
                         self.crowd_alerted = True
                     elif person_count < threshold:
                         self.crowd_alerted = False  # Reset for next alert
             
             # ========== ZONE INTRUSION DETECTION ==========
-            try:
-                from zone_manager import get_zone_manager
-                zone_mgr = get_zone_manager()
-                intrusions = zone_mgr.check_intrusions(detections)
-                for intrusion in intrusions:
-                    zone_name = intrusion['zone']
-                    msg = f"🚧 ZONE INTRUSION: Person entered '{zone_name}'"
-                    # Find a matching rule or use first rule
-                    for rule in self.rules:
-                        prompt = rule['prompt'].lower()
-                        if 'zone' in prompt or 'intrusion' in prompt or 'restricted' in prompt:
-                            msg = f"🚧 [{rule['scenario']}] ZONE INTRUSION: '{zone_name}'"
-                            self._emit_event(msg, rule['id'], "zone_intrusion")
-                            break
-                    else:
-                        # No matching rule, still emit with generic ID
-                        if self.rules:
-                            self._emit_event(msg, self.rules[0]['id'], "zone_intrusion")
-            except Exception as e:
-                pass  # Zone detection is optional
-            
-            # Get set of detected class names
-            detected_classes = set(d['class'] for d in detections)
-            
-            # Check each rule against detections
-            for rule in self.rules:
-                if not rule.get('enabled', True):
-                    continue
-                    
-                prompt = rule['prompt'].lower()
-                scenario = rule['scenario']
-                
-                # Skip behavior rules (handled separately above)
-                if 'loiter' in prompt or 'stay' in prompt or 'remain' in prompt or 'crowd' in prompt or 'gathering' in prompt:
+            intrusions = []
+            if self._zone_mgr is not None:
+                try:
+                    intrusions = self._zone_mgr.check_intrusions(detections)
+                except Exception:
+                    pass  # Zone detection is optional
+            for intrusion in intrusions:
+                zone_name = intrusion['zone']
+                msg = f"🚧 ZONE INTRUSION: Person entered '{zone_name}'"
+                # Find a matching rule or use first rule
+                for rule in rules:
+                    if rule.is_zone:
+                        msg = f"🚧 [{rule.scenario}] ZONE INTRUSION: '{zone_name}'"
+                        self._emit_event(msg, rule.id, "zone_intrusion")
+                        break
+                else:
+                    # No matching rule, still emit with generic ID
+                    if rules:
+                        self._emit_event(msg, rules[0].id, "zone_intrusion")
+            
+            # Check each rule against the detected classes
+            for rule in rules:
+                # Skip disabled and behavior rules (handled separately above)
+                if not rule.enabled or rule.is_behavior:
                     continue
                 
-                # Check if any detected class matches the prompt
-                for det in detections:
-                    class_name = det['class']
-                    conf = det['confidence']
-                    
-                    # Match if class name appears in prompt
-                    if class_name in prompt or self._fuzzy_match(prompt, class_name):
+                for class_name, conf in first_by_class.items():
+                    if self._matches(rule, class_name):
                         # Avoid spamming same detection
-                        key = f"{rule['id']}_{class_name}"
-                        if key not in self.last_detections:
-                            self.last_detections.add(key)
-                            
-                            msg = f"🎯 [{scenario}] DETECTED: {class_name} (conf: {conf:.2f})"
-                            event_data = {
-                                "description": msg,
-                                "timestamp": datetime.now().strftime("%H:%M:%S"),
-                                "rule_id": rule['id'],
-                                "class": class_name,
-                                "confidence": conf
-                            }
-                            self.event_detected.emit(event_data)
-            
-            # Clear old detections periodically (allow re-detection)
-            if len(self.last_detections) > 50:
-                self.last_detections.clear()
+                        if self._should_alert((rule.id, class_name)):
+                            msg = f"🎯 [{rule.scenario}] DETECTED: {class_name} (conf: {conf:.2f})"
+                            self.event_detected.emit(DetectionEvent(
+                                description=msg,
+                                timestamp=self._timestamp(),
+                                rule_id=rule.id,
+                                event_type="detection",
+                                class_name=class_name,
+                                confidence=conf
+                            ))
+    
+    def _matches(self, rule: Rule, class_name: str) -> bool:
+        """Whether a rule's prompt refers to a class; memoized since both are fixed."""
+        key = (rule.id, class_name)
+        hit = self._match_cache.get(key)
+        if hit is None:
+            prompt = rule.prompt_lower
+            hit = self._match_cache[key] = class_name in prompt or self._fuzzy_match(prompt, class_name)
+        return hit
+    
+    def _timestamp(self) -> str:
+        """Format the tick's timestamp on first use and reuse it for later events."""
+        if self._tick_ts is None:
+            self._tick_ts = _fast_ts()
+        return self._tick_ts
+    
+    def _should_alert(self, key) -> bool:
+        """Debounce alerts per key; entries expire individually after the TTL."""
+        now = time.monotonic()
+        recent = self.last_detections
+        # Insertion order is time order, so expired entries are always at the front
+        while recent:
+            ts = next(iter(recent.values()))
+            if now - ts <= self.ALERT_DEBOUNCE_SECONDS:
+                break
+            recent.popitem(last=False)
+        if key in recent:
+            return False
+        recent[key] = now
+        if len(recent) > self.ALERT_CACHE_SIZE:
+            recent.popitem(last=False)
+        return True
+    
+    def stop(self):
+        """Signal the worker loop to exit without waiting for the next tick."""
+        self.running = False
+        self._stop.set()
     
     def _fuzzy_match(self, prompt: str, class_name: str) -> bool:
         """Check for related terms."""
@@ -1317,13 +1324,12 @@ class LocalAIWorker(QThread):
     
     def _emit_event(self, msg: str, rule_id: int, event_type: str):
         """Helper to emit event data and trigger desktop notification."""
-        event_data = {
-            "description": msg,
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
-            "rule_id": rule_id,
-            "event_type": event_type
-        }
-        self.event_detected.emit(event_data)
+        self.event_detected.emit(DetectionEvent(
+            description=msg,
+            timestamp=self._timestamp(),
+            rule_id=rule_id,
+            event_type=event_type
+        ))
         
         # Trigger desktop notification
         try:
@@ -1344,15 +1350,31 @@ class LocalAIWorker(QThread):
 # ==================== GRID TAB ====================
 class GridTab(QWidget):
     """CCTV Grid with AI-Powered Real-Time Monitoring."""
+    frame_ready = Signal(str, int)  # cam_id, frame_seq (emitted from the camera thread)
+    
+    PLACEHOLDER_CSS = "background-color: #0d0d0d; color: #333; border: 1px dashed #222; font-weight: bold;"
     
     def __init__(self, multi_cam):
         super().__init__()
         self.multi_cam = multi_cam
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_grid)
-        self.timer.start(100)
         self.grid_widgets = {}
         
+        # Current grid layout, used by rebuild_grid to touch only changed cells
+        self._grid_cols = 0
+        self._grid_slots = []        # widget in each cell, row-major
+        self._placeholder_pool = []  # detached "NO SIGNAL" labels for reuse
+        self._cell_pos = {}          # cam_id -> (row, col), refreshed by rebuild_grid
+        self._stretched = None       # (row, col) currently enlarged by select_camera
+        self._selected_widget = None
+        
+        # Repaint a camera only when it produces a frame (no polling timer)
+        self.frame_ready.connect(self._on_frame, Qt.QueuedConnection)
+        self.multi_cam.add_frame_listener(self.frame_ready.emit)
+        
+        # Per-camera display buffers, reused every frame (see _display_image)
+        self._frame_bufs = {}  # cam_id -> BGR ndarray sized to the widget
+        self._qimages = {}     # cam_id -> QImage viewing _frame_bufs[cam_id]
+        
         # RTStream state
         self.rtstream_monitor = None
         self.current_stream_id = None
@@ -1380,13 +1402,13 @@ class GridTab(QWidget):
         cam_btn_row.addWidget(self.btn_add)
         
         self.btn_add_webcam = QPushButton("Webcam")
-        self.btn_add_webcam.setIcon(qta.icon('fa5s.camera'))
+        self.btn_add_webcam.setIcon(_icon('fa5s.camera'))
         self.btn_add_webcam.setStyleSheet("background-color: #4CAF50;")
         self.btn_add_webcam.clicked.connect(self.add_webcam)
         cam_btn_row.addWidget(self.btn_add_webcam)
         
         self.btn_add_dummy = QPushButton("Add Demo Cam")
-        self.btn_add_dummy.setIcon(qta.icon('fa5s.plus-circle'))
+        self.btn_add_dummy.setIcon(_icon('fa5s.plus-circle'))
         self.btn_add_dummy.clicked.connect(self.add_dummy_camera)
         cam_btn_row.addWidget(self.btn_add_dummy)
         
@@ -1398,6 +1420,9 @@ class GridTab(QWidget):
         self.cam_list = QListWidget()
         self.cam_list.setMaximumHeight(100)
         controls.addWidget(self.cam_list)
+        # Size policy shared by every grid cell
+        self._h_policy = self.cam_list.sizePolicy().horizontalPolicy()
+        self._v_policy = self.cam_list.sizePolicy().verticalPolicy()
         
         # AI Detection Rules Section
         controls.addWidget(QLabel(""))  # Spacer
@@ -1408,9 +1433,9 @@ class GridTab(QWidget):
         
         # Scenario dropdown
         self.scenario_combo = QComboBox()
-        from rtstream_monitor import DetectionScenario, get_scenario_prompt
         for scenario in DetectionScenario:
             self.scenario_combo.addItem(scenario.value, scenario)
+        self._prompt_cache = {s: get_scenario_prompt(s) for s in DetectionScenario}
         self.scenario_combo.currentIndexChanged.connect(self.on_scenario_changed)
         controls.addWidget(self.scenario_combo)
         
@@ -1426,13 +1451,13 @@ class GridTab(QWidget):
         # Add Rule button
         rule_btn_row = QHBoxLayout()
         self.btn_add_rule = QPushButton("Add Rule")
-        self.btn_add_rule.setIcon(qta.icon('fa5s.plus'))
+        self.btn_add_rule.setIcon(_icon('fa5s.plus'))
         self.btn_add_rule.setStyleSheet("background-color: #2196F3;")
         self.btn_add_rule.clicked.connect(self.add_rule)
         rule_btn_row.addWidget(self.btn_add_rule)
         
         self.btn_remove_rule = QPushButton("Remove")
-        self.btn_remove_rule.setIcon(qta.icon('fa5s.trash'))
+        self.btn_remove_rule.setIcon(_icon('fa5s.trash'))
         self.btn_remove_rule.clicked.connect(self.remove_rule)
         rule_btn_row.addWidget(self.btn_remove_rule)
         controls.addLayout(rule_btn_row)
@@ -1453,7 +1478,8 @@ class GridTab(QWidget):
         
         # Internal rules storage
         # Internal rules storage
-        self.active_rules = []  # List of {id, scenario, prompt, enabled}
+        self.active_rules = {}  # rule id -> Rule
+        self._next_rule_id = 1
         self.selected_cam_id = None
         
         # Stream source for monitoring
@@ -1482,26 +1508,26 @@ class GridTab(QWidget):
         # Control buttons
         monitor_btn_row = QHBoxLayout()
         self.btn_connect = QPushButton("Connect Stream")
-        self.btn_connect.setIcon(qta.icon('fa5s.link'))
+        self.btn_connect.setIcon(_icon('fa5s.link'))
         self.btn_connect.clicked.connect(self.connect_stream)
         monitor_btn_row.addWidget(self.btn_connect)
         
         self.btn_start_monitor = QPushButton("Start Monitoring")
-        self.btn_start_monitor.setIcon(qta.icon('fa5s.play'))
+        self.btn_start_monitor.setIcon(_icon('fa5s.play'))
         self.btn_start_monitor.clicked.connect(self.start_monitoring)
         self.btn_start_monitor.setEnabled(False)
         monitor_btn_row.addWidget(self.btn_start_monitor)
         controls.addLayout(monitor_btn_row)
         
         self.btn_stop_monitor = QPushButton("Stop Monitoring")
-        self.btn_stop_monitor.setIcon(qta.icon('fa5s.stop'))
+        self.btn_stop_monitor.setIcon(_icon('fa5s.stop'))
         self.btn_stop_monitor.clicked.connect(self.stop_monitoring)
         self.btn_stop_monitor.setEnabled(False)
         controls.addWidget(self.btn_stop_monitor)
         
         # Deep Analyze button (Twelve Labs on-demand)
         self.btn_deep_analyze = QPushButton("Deep Analyze (Twelve Labs)")
-        self.btn_deep_analyze.setIcon(qta.icon('fa5s.microscope'))
+        self.btn_deep_analyze.setIcon(_icon('fa5s.microscope'))
         self.btn_deep_analyze.setStyleSheet("background-color: #9C27B0; color: white; font-weight: bold;")
         self.btn_deep_analyze.clicked.connect(lambda: (print("[CLICK] Deep Analyze button pressed!"), self.deep_analyze()))
         self.btn_deep_analyze.setToolTip("Capture 5 sec clip and send to Twelve Labs for AI analysis")
@@ -1512,6 +1538,13 @@ class GridTab(QWidget):
         self.monitor_status.setStyleSheet("color: #888;")
         controls.addWidget(self.monitor_status)
         
+        # Status text is coalesced: only the latest value is painted, ~30 times/s max
+        self._pending_status = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(33)
+        self._status_timer.timeout.connect(self._flush_status)
+        
         controls.addStretch()
         main_layout.addLayout(controls, stretch=1)
         
@@ -1543,9 +1576,17 @@ class GridTab(QWidget):
         """)
         right_panel.addWidget(self.event_log)
         
+        # Batch log lines: one append (one layout pass) per 100 ms, capped history
+        self.event_log.document().setMaximumBlockCount(500)
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        
         # Refresh events button
         self.btn_refresh_events = QPushButton("Refresh Events")
-        self.btn_refresh_events.setIcon(qta.icon('fa5s.sync'))
+        self.btn_refresh_events.setIcon(_icon('fa5s.sync'))
         self.btn_refresh_events.clicked.connect(self.refresh_events)
         self.btn_refresh_events.setEnabled(False)
         right_panel.addWidget(self.btn_refresh_events)
@@ -1553,12 +1594,33 @@ class GridTab(QWidget):
         main_layout.addLayout(right_panel, stretch=3)
         self.setLayout(main_layout)
     
+    def _log(self, text):
+        """Queue a line for the event log; flushed in one append by _flush_log."""
+        self._log_buf.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+    
+    def _flush_log(self):
+        if self._log_buf:
+            self.event_log.append("\n".join(self._log_buf))
+            self._log_buf.clear()
+    
+    def _set_status(self, text):
+        """Queue a monitor status update; _flush_status shows the latest one."""
+        self._pending_status = text
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    def _flush_status(self):
+        if self._pending_status is not None:
+            self.monitor_status.setText(self._pending_status)
+            self._pending_status = None
+    
     def on_scenario_changed(self, index):
         """Update prompt when scenario changes."""
-        from rtstream_monitor import get_scenario_prompt
-        scenario = self.scenario_combo.currentData()
-        if scenario:
-            self.prompt_edit.setText(get_scenario_prompt(scenario))
+        prompt = self._prompt_cache.get(self.scenario_combo.currentData())
+        if prompt:
+            self.prompt_edit.setText(prompt)
     
     def add_rule(self):
         """Add current scenario/prompt as a new rule."""
@@ -1566,44 +1628,58 @@ class GridTab(QWidget):
         prompt = self.prompt_edit.toPlainText().strip()
         
         if not prompt:
-            self.monitor_status.setText("Enter a detection prompt first")
+            self._set_status("Enter a detection prompt first")
             return
         
-        # Create rule
-        rule_id = len(self.active_rules) + 1
-        rule = {
-            'id': rule_id,
-            'scenario': scenario.value if scenario else 'Custom',
-            'prompt': prompt,
-            'enabled': True
-        }
-        self.active_rules.append(rule)
-        
-        # Add to list widget with checkbox
-        from PySide6.QtWidgets import QListWidgetItem
-        from PySide6.QtCore import Qt
-        item = QListWidgetItem(f"[{rule['scenario']}] {prompt[:40]}...")
-        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-        item.setCheckState(Qt.Checked)
-        item.setData(Qt.UserRole, rule_id)
-        self.rules_list.addItem(item)
-        
-        self.monitor_status.setText(f"Added rule: {rule['scenario']}")
+        rule = self.bulk_add_rules([(scenario.value if scenario else 'Custom', prompt)])[0]
+        self._set_status(f"Added rule: {rule.scenario}")
+    
+    def bulk_add_rules(self, rules: list) -> list:
+        """Add several rules with a single list relayout/repaint.
+        
+        Args:
+            rules: (scenario name, prompt) pairs
+        
+        Returns:
+            The created Rule objects, in order
+        """
+        created = []
+        rules_list = self.rules_list
+        rules_list.setUpdatesEnabled(False)
+        rules_list.blockSignals(True)
+        try:
+            for scenario, prompt in rules:
+                rule_id = self._next_rule_id
+                self._next_rule_id += 1
+                rule = Rule(id=rule_id, scenario=scenario, prompt=prompt)
+                self.active_rules[rule_id] = rule
+                created.append(rule)
+                
+                # Add to list widget with checkbox
+                item = QListWidgetItem(f"[{rule.scenario}] {prompt[:40]}...")
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(Qt.Checked)
+                item.setData(Qt.UserRole, rule_id)
+                rules_list.addItem(item)
+        finally:
+            rules_list.blockSignals(False)
+            rules_list.setUpdatesEnabled(True)
         
         # Enable start if we have rules
-        if len(self.active_rules) > 0:
+        if self.active_rules:
             self.btn_start_monitor.setEnabled(True)
+        return created
     
     def remove_rule(self):
         """Remove selected rule from the list."""
         item = self.rules_list.currentItem()
         if item:
             rule_id = item.data(Qt.UserRole)
-            # Remove from internal list
-            self.active_rules = [r for r in self.active_rules if r['id'] != rule_id]
+            # Remove from internal rules
+            self.active_rules.pop(rule_id, None)
             # Remove from widget
             self.rules_list.takeItem(self.rules_list.row(item))
-            self.monitor_status.setText("🗑️ Rule removed")
+            self._set_status("🗑️ Rule removed")
             
             # Disable start if no rules
             if len(self.active_rules) == 0:
@@ -1615,7 +1691,7 @@ class GridTab(QWidget):
         
         # LOCAL WEBCAM DEMO
         if "Webcam" in source:
-            self.monitor_status.setText("✅ Demo Mode: Webcam Ready")
+            self._set_status("✅ Demo Mode: Webcam Ready")
             self.current_stream_id = "webcam_demo"
             self.btn_start_monitor.setEnabled(True)
             self.btn_connect.setEnabled(False)
@@ -1623,41 +1699,45 @@ class GridTab(QWidget):
 
         # VIDEODB RTSP
         if not source or "Custom" in source:
-            self.monitor_status.setText("⚠️ Enter valid RTSP URL")
+            self._set_status("⚠️ Enter valid RTSP URL")
             return
             
-        self.monitor_status.setText("Connecting to VideoDB...")
+        self._set_status("Connecting to VideoDB...")
+        self.btn_connect.setEnabled(False)
         
-        try:
-            from rtstream_monitor import RTStreamMonitor, StreamConfig, DetectionScenario
-            
-            # Initialize monitor if needed
-            if not self.rtstream_monitor:
-                self.rtstream_monitor = RTStreamMonitor(
-                    api_key="sk-idjvWUi2BhlxJnCKaHFUIaKmrdFLWteLPb2OqHmNjzY"
-                )
-            
-            scenario = self.scenario_combo.currentData() or DetectionScenario.CUSTOM
-            config = StreamConfig(
-                name=f"{scenario.value} Monitor",
-                rtsp_url=source,
-                scenario=scenario,
-                custom_prompt=self.prompt_edit.toPlainText()
-            )
-            
-            self.current_stream_id = self.rtstream_monitor.connect_stream(config)
-            self.monitor_status.setText(f"✅ Connected: {self.current_stream_id[:15]}...")
-            self.btn_start_monitor.setEnabled(True)
-            self.btn_connect.setEnabled(False)
-            
-        except Exception as e:
-            self.monitor_status.setText(f"❌ Error: {str(e)[:50]}")
+        scenario = self.scenario_combo.currentData() or DetectionScenario.CUSTOM
+        config = StreamConfig(
+            name=f"{scenario.value} Monitor",
+            rtsp_url=source,
+            scenario=scenario,
+            custom_prompt=self.prompt_edit.toPlainText()
+        )
+        
+        # Monitor creation and the connect call are network I/O; keep them off the UI thread
+        self.connect_worker = ConnectStreamWorker(
+            self.rtstream_monitor,
+            "sk-idjvWUi2BhlxJnCKaHFUIaKmrdFLWteLPb2OqHmNjzY",
+            config
+        )
+        self.connect_worker.connected.connect(self.on_stream_connected)
+        self.connect_worker.error.connect(self.on_stream_connect_error)
+        self.connect_worker.start()
+    
+    def on_stream_connected(self, monitor, stream_id: str):
+        self.rtstream_monitor = monitor
+        self.current_stream_id = stream_id
+        self._set_status(f"✅ Connected: {self.current_stream_id[:15]}...")
+        self.btn_start_monitor.setEnabled(True)
+    
+    def on_stream_connect_error(self, error: str):
+        self._set_status(f"❌ Error: {error[:50]}")
+        self.btn_connect.setEnabled(True)
     
     def start_monitoring(self):
         """Start AI monitoring."""
         # Check if rules list is populated
         if not self.active_rules:
-            self.monitor_status.setText("⚠️ Add at least one rule first")
+            self._set_status("⚠️ Add at least one rule first")
             return
             
         # For demo mode, don't require connect
@@ -1666,16 +1746,14 @@ class GridTab(QWidget):
             self.current_stream_id = "webcam_demo"
         
         if not self.current_stream_id:
-            self.monitor_status.setText("⚠️ Connect to a stream first")
+            self._set_status("⚠️ Connect to a stream first")
             return
-            
-        from rtstream_monitor import StreamConfig, DetectionScenario
         
         # --- LOCAL DEMO MODE ---
         if self.current_stream_id == "webcam_demo":
             rule_count = len(self.active_rules)
-            self.monitor_status.setText(f"🔴 LIVE (DEMO): {rule_count} rule(s) active")
-            self.local_worker = LocalAIWorker(self.multi_cam, self.active_rules)
+            self._set_status(f"🔴 LIVE (DEMO): {rule_count} rule(s) active")
+            self.local_worker = LocalAIWorker(self.multi_cam, list(self.active_rules.values()))
             self.local_worker.event_detected.connect(self.on_demo_event)
             self.local_worker.start()
             
@@ -1683,11 +1761,11 @@ class GridTab(QWidget):
             self.btn_stop_monitor.setEnabled(True)
             self.btn_add_rule.setEnabled(False)
             self.btn_remove_rule.setEnabled(False)
-            self.event_log.append(f"[INFO] Started Demo with {rule_count} active rules")
+            self._log(f"[INFO] Started Demo with {rule_count} active rules")
             return
             
         # --- VIDEODB MODE ---
-        self.monitor_status.setText("Starting VideoDB AI...")
+        self._set_status("Starting VideoDB AI...")
         
         try:
             config = StreamConfig(
@@ -1701,7 +1779,7 @@ class GridTab(QWidget):
             self.current_index_id = self.rtstream_monitor.start_monitoring(
                 self.current_stream_id,
                 config,
-                on_status=lambda s: self.monitor_status.setText(s)
+                on_status=self._set_status
             )
             
             # Create event if webhook provided
@@ -1710,43 +1788,42 @@ class GridTab(QWidget):
                 alert_id = self.rtstream_monitor.create_alert(
                     self.current_index_id, event_id, config.webhook_url
                 )
-                self.event_log.append(f"[ALERT] Webhook configured: {alert_id[:20]}...")
+                self._log(f"[ALERT] Webhook configured: {alert_id[:20]}...")
             
-            self.monitor_status.setText(f"🔴 LIVE: Monitoring for {scenario.value}")
+            self._set_status(f"🔴 LIVE: Monitoring for {scenario.value}")
             self.btn_start_monitor.setEnabled(False)
             self.btn_stop_monitor.setEnabled(True)
             self.btn_refresh_events.setEnabled(True)
             
-            self.event_log.append(f"[INFO] Started VideoDB Index: {self.current_index_id}")
+            self._log(f"[INFO] Started VideoDB Index: {self.current_index_id}")
             
         except Exception as e:
-            self.monitor_status.setText(f"Error: {str(e)[:50]}")
-            self.event_log.append(f"[ERROR] {str(e)}")
+            self._set_status(f"Error: {str(e)[:50]}")
+            self._log(f"[ERROR] {str(e)}")
     
-    def on_demo_event(self, event_data):
+    def on_demo_event(self, event: DetectionEvent):
         """Handle events from local demo worker."""
-        desc = event_data['description']
-        ts = event_data.get('timestamp', datetime.now().strftime("%H:%M:%S"))
-        self.event_log.append(f"[{ts}] {desc}")
+        ts = event.timestamp or _fast_ts()
+        self._log(f"[{ts}] {event.description}")
     
     def stop_monitoring(self):
         """Stop AI monitoring."""
         # Stop Local Demo
         if self.local_worker and self.local_worker.isRunning():
-            self.local_worker.running = False
+            self.local_worker.stop()
             self.local_worker.wait()
             self.local_worker = None
-            self.event_log.append("[INFO] Stopped Demo Monitoring")
+            self._log("[INFO] Stopped Demo Monitoring")
             
         # Stop VideoDB
         elif self.current_index_id and self.rtstream_monitor:
             try:
                 self.rtstream_monitor.stop_monitoring(self.current_index_id)
-                self.event_log.append(f"[INFO] Stopped VideoDB Monitoring")
+                self._log(f"[INFO] Stopped VideoDB Monitoring")
             except Exception as e:
-                self.event_log.append(f"[ERROR] {str(e)}")
+                self._log(f"[ERROR] {str(e)}")
         
-        self.monitor_status.setText("Monitoring stopped")
+        self._set_status("Monitoring stopped")
         self.btn_start_monitor.setEnabled(len(self.active_rules) > 0)
         self.btn_stop_monitor.setEnabled(False)
         self.btn_connect.setEnabled(True)
@@ -1760,17 +1837,17 @@ class GridTab(QWidget):
         print(f"[DEBUG] API Key present: {bool(TWELVE_LABS_API_KEY)}")
         
         if not TWELVE_LABS_API_KEY:
-            self.monitor_status.setText("API Key Missing")
+            self._set_status("API Key Missing")
             QMessageBox.warning(self, "Missing API Key", "Please set TWELVE_LABS_API_KEY env var.")
             return
 
         self.btn_deep_analyze.setEnabled(False)
-        self.monitor_status.setText("Starting Deep Analysis...")
+        self._set_status("Starting Deep Analysis...")
         print("[DEBUG] Starting DeepAnalyzeWorker...")
         
         # Start Worker
         self.analyze_worker = DeepAnalyzeWorker(TWELVE_LABS_API_KEY, self.multi_cam)
-        self.analyze_worker.status_update.connect(self.monitor_status.setText)
+        self.analyze_worker.status_update.connect(self._set_status)
         self.analyze_worker.finished.connect(self.on_analyze_finished)
         self.analyze_worker.error.connect(self.on_analyze_error)
         self.analyze_worker.start()
@@ -1779,14 +1856,14 @@ class GridTab(QWidget):
     def on_analyze_finished(self, result: str):
         """Handle successful analysis."""
         self.btn_deep_analyze.setEnabled(True)
-        self.monitor_status.setText("Analysis Complete")
-        self.event_log.append(f"[DEEP ANALYZE] {result}")
+        self._set_status("Analysis Complete")
+        self._log(f"[DEEP ANALYZE] {result}")
         
     def on_analyze_error(self, error: str):
         """Handle analysis error."""
         self.btn_deep_analyze.setEnabled(True)
-        self.monitor_status.setText(f"Error: {error}")
-        self.event_log.append(f"[ERROR] Deep Analyze failed: {error}")
+        self._set_status(f"Error: {error}")
+        self._log(f"[ERROR] Deep Analyze failed: {error}")
         
 
     
@@ -1795,22 +1872,33 @@ class GridTab(QWidget):
         if not self.current_index_id or not self.rtstream_monitor:
             return
         
-        try:
-            scenes = self.rtstream_monitor.get_recent_scenes(self.current_index_id)
-            if scenes:
-                self.event_log.append(f"\n--- Recent Detections ({len(scenes)}) ---")
-                for scene in scenes:
-                    desc = scene.get('description', 'No description')[:80]
-                    self.event_log.append(f"[SCENE] {desc}")
-            else:
-                self.event_log.append("[INFO] No new scenes detected yet")
-        except Exception as e:
-            self.event_log.append(f"[ERROR] {str(e)}")
+        # Network round-trip: fetch off the UI thread
+        self.btn_refresh_events.setEnabled(False)
+        self.scenes_worker = RecentScenesWorker(self.rtstream_monitor, self.current_index_id)
+        self.scenes_worker.scenes_ready.connect(self.on_scenes_ready)
+        self.scenes_worker.error.connect(self.on_scenes_error)
+        self.scenes_worker.start()
+    
+    def on_scenes_ready(self, scenes: list):
+        self.btn_refresh_events.setEnabled(True)
+        if scenes:
+            lines = [f"\n--- Recent Detections ({len(scenes)}) ---"]
+            for scene in scenes:
+                desc = scene.get('description', 'No description')[:80]
+                lines.append(f"[SCENE] {desc}")
+            self._log("\n".join(lines))
+        else:
+            self._log("[INFO] No new scenes detected yet")
+    
+    def on_scenes_error(self, error: str):
+        self.btn_refresh_events.setEnabled(True)
+        self._log(f"[ERROR] {error}")
 
     # ---- Original Camera Methods ----
     def add_camera(self):
         source = self.cam_input.text()
         if source:
+            cam_id = self.multi_cam.add_camera(source)
             if cam_id:
                 # Store ID in user data
                 item = QListWidgetItem(cam_id)
@@ -1819,10 +1907,7 @@ class GridTab(QWidget):
                 
                 lbl = ClickableCameraWidget(cam_id, f"Loading {cam_id}...")
                 lbl.setMinimumSize(320, 240)
-                lbl.setSizePolicy(
-                    self.cam_list.sizePolicy().horizontalPolicy(), 
-                    self.cam_list.sizePolicy().verticalPolicy()
-                )
+                lbl.setSizePolicy(self._h_policy, self._v_policy)
                 lbl.default_style = "background-color: gray; border: 1px solid white;"
                 lbl.setStyleSheet(lbl.default_style)
                 lbl.clicked.connect(self.select_camera)
@@ -1842,10 +1927,7 @@ class GridTab(QWidget):
             
             lbl = ClickableCameraWidget(cam_id, "Webcam Loading...")
             lbl.setMinimumSize(320, 240)
-            lbl.setSizePolicy(
-                self.cam_list.sizePolicy().horizontalPolicy(), 
-                self.cam_list.sizePolicy().verticalPolicy()
-            )
+            lbl.setSizePolicy(self._h_policy, self._v_policy)
             lbl.default_style = "background-color: #1a1a1a; border: 2px solid #4CAF50;"
             lbl.setStyleSheet(lbl.default_style)
             lbl.clicked.connect(self.select_camera)
@@ -1865,10 +1947,7 @@ class GridTab(QWidget):
         # Create reactive looking widget
         lbl = ClickableCameraWidget(cam_id, f"DEMO CAMERA\n{cam_id}")
         lbl.setMinimumSize(320, 240)
-        lbl.setSizePolicy(
-            self.cam_list.sizePolicy().horizontalPolicy(), 
-            self.cam_list.sizePolicy().verticalPolicy()
-        )
+        lbl.setSizePolicy(self._h_policy, self._v_policy)
         lbl.default_style = "background-color: #2b2b2b; color: #555; border: 2px solid #444; font-weight: bold;"
         lbl.setStyleSheet(lbl.default_style)
         lbl.clicked.connect(self.select_camera)
@@ -1880,30 +1959,30 @@ class GridTab(QWidget):
         """Highlight selected camera and make it bigger."""
         self.selected_cam_id = cam_id
         
-        # Reset stretches first (default 1)
-        for r in range(self.grid_layout.rowCount()):
-            self.grid_layout.setRowStretch(r, 1)
-        for c in range(self.grid_layout.columnCount()):
-            self.grid_layout.setColumnStretch(c, 1)
-            
-        # Update styles and stretches
-        selected_row, selected_col = -1, -1
+        grid = self.grid_layout
         
-        for k, widget in self.grid_widgets.items():
-            is_selected = (k == cam_id)
-            if isinstance(widget, ClickableCameraWidget):
-                widget.set_selected(is_selected)
-            
-            if is_selected:
-                # Find position in grid
-                idx = self.grid_layout.indexOf(widget)
-                if idx >= 0:
-                    selected_row, selected_col, _, _ = self.grid_layout.getItemPosition(idx)
+        # Reset only the row/col enlarged by the previous selection (default 1)
+        if self._stretched is not None:
+            row, col = self._stretched
+            grid.setRowStretch(row, 1)
+            grid.setColumnStretch(col, 1)
+            self._stretched = None
+        
+        # Update styles: just the old and new selection
+        widget = self.grid_widgets.get(cam_id)
+        if self._selected_widget is not None and self._selected_widget is not widget:
+            self._selected_widget.set_selected(False)
+        if isinstance(widget, ClickableCameraWidget):
+            widget.set_selected(True)
+        self._selected_widget = widget
         
         # Apply stretch factor 10 to the row/col of selected item (Huge difference)
-        if selected_row >= 0 and selected_col >= 0:
-            self.grid_layout.setRowStretch(selected_row, 10) # Make it DOMINANT
-            self.grid_layout.setColumnStretch(selected_col, 10)
+        pos = self._cell_pos.get(cam_id)
+        if pos is not None:
+            row, col = pos
+            grid.setRowStretch(row, 10) # Make it DOMINANT
+            grid.setColumnStretch(col, 10)
+            self._stretched = pos
 
     def remove_camera(self):
         item = self.cam_list.currentItem()
@@ -1920,63 +1999,124 @@ class GridTab(QWidget):
             # (multi_cam might use int 0, grid_widgets uses same key)
             
             if cam_id in self.grid_widgets:
+                if self._selected_widget is self.grid_widgets[cam_id]:
+                    self._selected_widget = None
                 self.grid_layout.removeWidget(self.grid_widgets[cam_id])
                 self.grid_widgets[cam_id].deleteLater()
                 del self.grid_widgets[cam_id]
                 self.rebuild_grid()
 
     def rebuild_grid(self):
-        """Rebuild grid with dynamic flexible layout (up to N x N)."""
-        # Clear layout first
-        for i in reversed(range(self.grid_layout.count())): 
-            item = self.grid_layout.itemAt(i)
-            if item.widget():
-                if item.widget() not in self.grid_widgets.values():
-                    item.widget().deleteLater() # Delete placeholders
-                else:
-                    item.widget().setParent(None) # Remove camera from layout temporarily
-
+        """Rebuild grid with dynamic flexible layout (up to N x N).
+        
+        Only cells whose occupant changed are touched; the whole layout is
+        redone only when the grid dimension changes.
+        """
         active_cams = list(self.grid_widgets.values())
         
+        # Drop display buffers of removed cameras
+        for cam_id in list(self._frame_bufs):
+            if cam_id not in self.grid_widgets:
+                self._frame_bufs.pop(cam_id)
+                self._qimages.pop(cam_id)
+        
         # Calculate optimal grid size
         # If 1-4 items -> 2x2. 5-9 -> 3x3. 10-16 -> 4x4.
         count = len(active_cams)
-        cols = 2
-        
-        if count > 0:
-            cols = math.ceil(math.sqrt(count))
-            if cols < 2: cols = 2 # Minimum 2x2
+        cols = _grid_cols(count)
             
         total_slots = cols * cols # Make it a perfect square
+        self._cell_pos = {cam_id: divmod(i, cols) for i, cam_id in enumerate(self.grid_widgets)}
+        
+        if cols != self._grid_cols:
+            # Grid dimension changed: clear every cell and lay out from scratch
+            for widget in self._grid_slots:
+                if widget is not None:
+                    self._release_cell(widget)
+            self._grid_slots = [None] * total_slots
+            self._grid_cols = cols
         
         for i in range(total_slots):
-            row = i // cols
-            col = i % cols
-            
-            if i < len(active_cams):
-                self.grid_layout.addWidget(active_cams[i], row, col)
-                active_cams[i].show()
+            want = active_cams[i] if i < count else None  # None = placeholder
+            have = self._grid_slots[i]
+            if want is None:
+                if have is not None and not isinstance(have, ClickableCameraWidget):
+                    continue  # Already a placeholder
+            elif have is want:
+                continue
+            
+            if have is not None:
+                self._release_cell(have)
+            if want is None:
+                widget = self._take_placeholder()
             else:
-                placeholder = QLabel("OFFLINE / NO SIGNAL")
-                placeholder.setMinimumSize(320, 240) # Allow shrinking
-                placeholder.setSizePolicy(
-                    self.cam_list.sizePolicy().horizontalPolicy(), 
-                    self.cam_list.sizePolicy().verticalPolicy()
-                )
-                placeholder.setStyleSheet("""
-                    background-color: #0d0d0d; 
-                    color: #333; 
-                    border: 1px dashed #222; 
-                    font-weight: bold;
-                """)
-                placeholder.setAlignment(Qt.AlignCenter)
-                self.grid_layout.addWidget(placeholder, row, col)
-
-    def update_grid(self):
-        for cam_id, lbl in self.grid_widgets.items():
-            frame = self.multi_cam.get_frame(cam_id)
-            if frame is not None:
-                lbl.setPixmap(convert_cv_qt(frame))
+                # Camera shifting from another cell (e.g. after a removal)
+                for j, other in enumerate(self._grid_slots):
+                    if other is want:
+                        self.grid_layout.removeWidget(want)
+                        self._grid_slots[j] = None
+                        break
+                widget = want
+            
+            self.grid_layout.addWidget(widget, i // cols, i % cols)
+            widget.show()
+            self._grid_slots[i] = widget
+    
+    def _take_placeholder(self):
+        """Get an empty-cell label from the pool, creating one if needed."""
+        if self._placeholder_pool:
+            return self._placeholder_pool.pop()
+        placeholder = QLabel("OFFLINE / NO SIGNAL")
+        placeholder.setMinimumSize(320, 240) # Allow shrinking
+        placeholder.setSizePolicy(self._h_policy, self._v_policy)
+        placeholder.setStyleSheet(self.PLACEHOLDER_CSS)
+        placeholder.setAlignment(Qt.AlignCenter)
+        return placeholder
+    
+    def _release_cell(self, widget):
+        """Take a widget out of the grid; placeholders go back to the pool."""
+        self.grid_layout.removeWidget(widget)
+        if not isinstance(widget, ClickableCameraWidget):
+            widget.hide()
+            self._placeholder_pool.append(widget)
+
+    def _on_frame(self, cam_id, seq):
+        """Display a camera's newest frame (slot for frame_ready)."""
+        lbl = self.grid_widgets.get(cam_id)
+        # Several queued signals can pile up; only the newest needs drawing
+        if lbl is None or seq <= lbl.last_seq:
+            return
+        seq = self.multi_cam.get_frame_seq(cam_id)
+        frame = self.multi_cam.get_frame(cam_id)
+        if frame is None:
+            return
+        w, h = lbl.frame_size
+        if w <= 0 or h <= 0:
+            return
+        # Write into the cell's own buffer: the widget paints from it later,
+        # after the camera ring may have moved on
+        buf, qimg = self._display_image(cam_id, w, h)
+        if frame.shape[:2] == (h, w):
+            np.copyto(buf, frame)
+        else:
+            interp = cv2.INTER_AREA if frame.shape[1] > w else cv2.INTER_LINEAR
+            cv2.resize(frame, (w, h), dst=buf, interpolation=interp)
+        lbl.set_image(qimg)
+        lbl.last_seq = seq
+    
+    def _display_image(self, cam_id, w, h):
+        """Get the persistent (frame buffer, QImage) for a camera at w x h.
+        
+        The QImage wraps the BGR buffer without copying (Qt reads BGR888
+        natively), so frames are resized into it in place and the widget
+        paints it directly, with no per-frame QPixmap.
+        """
+        buf = self._frame_bufs.get(cam_id)
+        if buf is None or buf.shape[:2] != (h, w):
+            buf = np.empty((h, w, 3), np.uint8)
+            self._frame_bufs[cam_id] = buf
+            self._qimages[cam_id] = QImage(buf.data, w, h, 3 * w, QImage.Format_BGR888)
+        return buf, self._qimages[cam_id]
 
 
 # ==================== SETTINGS TAB ====================
@@ -2014,7 +2154,7 @@ class SettingsTab(QWidget):
         sec_layout.addRow("Confirm Password:", self.confirm_pass)
         
         self.btn_update = QPushButton("Update Password")
-        self.btn_update.setIcon(qta.icon('fa5s.key', color='white'))
+        self.btn_update.setIcon(_icon('fa5s.key', color='white'))
         self.btn_update.setStyleSheet("background-color: #0E639C; margin-top: 10px;")
         self.btn_update.clicked.connect(self.update_password)
         sec_layout.addRow("", self.btn_update)
@@ -2027,7 +2167,7 @@ class SettingsTab(QWidget):
         sess_layout = QVBoxLayout()
         
         self.btn_logout = QPushButton("Logout")
-        self.btn_logout.setIcon(qta.icon('fa5s.sign-out-alt', color='white'))
+        self.btn_logout.setIcon(_icon('fa5s.sign-out-alt', color='white'))
         self.btn_logout.setStyleSheet("background-color: #D32F2F; font-weight: bold; padding: 10px;")
         self.btn_logout.clicked.connect(self.logout_requested.emit)
         sess_layout.addWidget(self.btn_logout)
@@ -2080,70 +2220,6 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(QIcon())  # Remove default icon
         self.setGeometry(100, 100, 1400, 900)
         
-        # Global Polished Stylesheet
-        self.setStyleSheet("""
-            QMainWindow { background-color: #121212; color: #E0E0E0; font-family: 'Segoe UI', sans-serif; }
-            
-            /* Input Fields - Professional Dark Look */
-            QLineEdit, QComboBox, QTextEdit {
-                background-color: #252526;
-                color: #E0E0E0;
-                border: 1px solid #3E3E42;
-                border-radius: 2px;
-                padding: 6px;
-                selection-background-color: #264F78;
-            }
-            QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
-                border: 1px solid #007ACC;
-                background-color: #2D2D30;
-            }
-            QLineEdit:disabled, QComboBox:disabled {
-                background-color: #1E1E1E;
-                color: #555;
-            }
-
-            /* Buttons */
-            QPushButton {
-                background-color: #0E639C;
-                color: white;
-                border: none;
-                padding: 6px 14px;
-                border-radius: 2px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #1177BB; }
-            QPushButton:pressed { background-color: #094771; }
-            QPushButton:disabled { background-color: #333; color: #888; }
-            
-            /* Group Boxes */
-            QGroupBox {
-                border: 1px solid #333;
-                border-radius: 2px;
-                margin-top: 10px;
-                padding-top: 14px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-                color: #AAA;
-            }
-            
-            /* Tabs */
-            QTabWidget::pane { border: 1px solid #333; }
-            QTabBar::tab {
-                background: #1a1a1a;
-                color: #888;
-                padding: 8px 16px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            QTabBar::tab:selected {
-                background: #252526;
-                color: white;
-                border-bottom: 2px solid #007ACC;
-            }
-        """)
 
         self.face_handler = FaceHandler()
         self.data_manager = DataManager()
@@ -2159,9 +2235,9 @@ class MainWindow(QMainWindow):
         self.settings_tab.logout_requested.connect(self.on_logout)
         
 
-        self.tabs.addTab(self.video_tab, qta.icon('fa5s.search'), "Video Analysis (AI)")
-        self.tabs.addTab(self.grid_tab, qta.icon('fa5s.th'), "CCTV Grid")
-        self.tabs.addTab(self.settings_tab, qta.icon('fa5s.cog'), "Settings")
+        self.tabs.addTab(self.video_tab, _icon('fa5s.search'), "Video Analysis (AI)")
+        self.tabs.addTab(self.grid_tab, _icon('fa5s.th'), "CCTV Grid")
+        self.tabs.addTab(self.settings_tab, _icon('fa5s.cog'), "Settings")
         
         # Logout flag
         self.logout_triggered = False
@@ -2175,11 +2251,34 @@ class MainWindow(QMainWindow):
             self.close()
 
     def closeEvent(self, event):
+        worker = self.grid_tab.local_worker
+        if worker and worker.isRunning():
+            worker.stop()
+            worker.wait()
         self.multi_cam.stop()
         event.accept()
 
 
 # ==================== LOGIN DIALOG ====================
+class AuthWorker(QThread):
+    """Background worker for password verification (salted hashing is slow by design)."""
+    result = Signal(bool)
+    error = Signal(str)
+    
+    def __init__(self, username: str, password: str):
+        super().__init__()
+        self.username = username
+        self.password = password
+    
+    def run(self):
+        try:
+            from auth_manager import get_auth_manager
+            auth = get_auth_manager()
+            self.result.emit(auth.authenticate(self.username, self.password))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class LoginDialog(QDialog):
     """Secure Login Dialog (Metagros/Palantir Style)."""
     
@@ -2197,13 +2296,7 @@ class LoginDialog(QDialog):
         
         # Frame
         frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background-color: #1a1a1a;
-                border: 2px solid #333;
-                border-radius: 8px;
-            }
-        """)
+        frame.setObjectName("loginFrame")
         layout.addWidget(frame)
         
         flayout = QVBoxLayout(frame)
@@ -2224,42 +2317,20 @@ class LoginDialog(QDialog):
         # User Input
         self.user_input = QLineEdit()
         self.user_input.setPlaceholderText("OPERATOR ID")
-        self.user_input.setStyleSheet("""
-            QLineEdit {
-                background-color: #2b2b2b;
-                border: 1px solid #444;
-                padding: 5px 10px;
-                color: #fff;
-                font-family: Consolas, monospace;
-                min-height: 35px;
-                margin-bottom: 5px;
-            }
-            QLineEdit:focus { border: 2px solid #4CAF50; background-color: #333; }
-        """)
+        self.user_input.setObjectName("loginInput")
         flayout.addWidget(self.user_input)
         
         # Password Input
         self.pass_input = QLineEdit()
         self.pass_input.setPlaceholderText("ACCESS KEY")
         self.pass_input.setEchoMode(QLineEdit.Password)
-        self.pass_input.setStyleSheet(self.user_input.styleSheet())
+        self.pass_input.setObjectName("loginInput")
         flayout.addWidget(self.pass_input)
         
         # Login Button
         self.btn_login = QPushButton("AUTHENTICATE")
         self.btn_login.setCursor(Qt.PointingHandCursor)
-        self.btn_login.setStyleSheet("""
-            QPushButton {
-                background-color: #333;
-                color: #fff;
-                border: 1px solid #444;
-                padding: 10px;
-                font-weight: bold;
-                letter-spacing: 1px;
-                min-height: 40px;
-            }
-            QPushButton:hover { background-color: #4CAF50; color: #000; border: 1px solid #4CAF50; }
-        """)
+        self.btn_login.setObjectName("loginButton")
         self.btn_login.clicked.connect(self.authenticate)
         flayout.addWidget(self.btn_login)
         
@@ -2281,44 +2352,35 @@ class LoginDialog(QDialog):
             self.status.setStyleSheet("color: #FF5722; font-size: 9px; border: none;")
             return
             
-        try:
-            from auth_manager import get_auth_manager
-            auth = get_auth_manager()
-            if auth.authenticate(username, password):
-                self.status.setText("ACCESS GRANTED")
-                self.status.setStyleSheet("color: #4CAF50; font-size: 9px; border: none;")
-                QTimer.singleShot(500, self.accept)  # Delay to show success
-            else:
-                self.status.setText("ACCESS DENIED")
-                self.status.setStyleSheet("color: #F44336; font-size: 9px; border: none;")
-                self.pass_input.clear()
-        except Exception as e:
-            self.status.setText(f"ERROR: {str(e)}")
+        self.btn_login.setEnabled(False)
+        self.status.setText("VERIFYING...")
+        self.auth_worker = AuthWorker(username, password)
+        self.auth_worker.result.connect(self.on_auth_result)
+        self.auth_worker.error.connect(self.on_auth_error)
+        self.auth_worker.start()
+    
+    def on_auth_result(self, granted: bool):
+        if granted:
+            self.status.setText("ACCESS GRANTED")
+            self.status.setStyleSheet("color: #4CAF50; font-size: 9px; border: none;")
+            QTimer.singleShot(500, self.accept)  # Delay to show success
+        else:
+            self.status.setText("ACCESS DENIED")
+            self.status.setStyleSheet("color: #F44336; font-size: 9px; border: none;")
+            self.pass_input.clear()
+            self.btn_login.setEnabled(True)
+    
+    def on_auth_error(self, error: str):
+        self.status.setText(f"ERROR: {error}")
+        self.btn_login.setEnabled(True)
 
 
 # ==================== ENTRY POINT ====================
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     
-    # Dark theme
-    app.setStyleSheet("""
-        QMainWindow, QWidget { background-color: #121212; color: #e0e0e0; font-family: 'Segoe UI', sans-serif; }
-        QGroupBox { font-weight: bold; border: 1px solid #333; border-radius: 4px; margin-top: 10px; padding-top: 10px; background-color: #1e1e1e; }
-        QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; color: #888; }
-        QPushButton { background-color: #2d2d2d; border: 1px solid #444; padding: 6px 14px; border-radius: 2px; }
-        QPushButton:hover { background-color: #3d3d3d; border-color: #666; }
-        QPushButton:checked { background-color: #4CAF50; color: #000; border-color: #4CAF50; }
-        QPushButton:disabled { background-color: #1a1a1a; color: #444; border-color: #222; }
-        QLineEdit, QTextEdit, QComboBox { background-color: #2d2d2d; border: 1px solid #444; padding: 6px; border-radius: 2px; color: #fff; }
-        QLineEdit:focus { border: 1px solid #555; }
-        QTableWidget { background-color: #1e1e1e; gridline-color: #333; border: 1px solid #333; }
-        QHeaderView::section { background-color: #2d2d2d; padding: 6px; border: 1px solid #333; font-weight: bold; }
-        QTabWidget::pane { border: 1px solid #333; background-color: #1e1e1e; }
-        QTabBar::tab { background-color: #1a1a1a; padding: 10px 25px; margin-right: 2px; color: #888; }
-        QTabBar::tab:selected { background-color: #1e1e1e; color: #4CAF50; border-top: 2px solid #4CAF50; }
-        QScrollBar:vertical { width: 10px; background: #121212; }
-        QScrollBar::handle:vertical { background: #333; border-radius: 5px; }
-    """)
+    # Dark theme (app-wide, parsed once for every window/dialog)
+    app.setStyleSheet(load_stylesheet())
     
     # Show Login First
     # Main Loop (to support Logout)
@@ -6,6 +6,7 @@ detection scenarios and webhook alerts.
 """
 
 import os
+from collections import OrderedDict, defaultdict
 from enum import Enum
 from dataclasses import dataclass
 from typing import Optional, Callable
@@ -71,6 +72,9 @@ SCENARIO_PROMPTS = {
     DetectionScenario.CUSTOM:
         "Describe what is happening in this scene in detail."
 }
+# Scenarios without their own prompt fall back to the CUSTOM one
+_DEFAULT_PROMPT = SCENARIO_PROMPTS[DetectionScenario.CUSTOM]
+SCENARIO_PROMPTS = defaultdict(lambda: _DEFAULT_PROMPT, SCENARIO_PROMPTS)
 
 SCENARIO_EVENTS = {
     DetectionScenario.FLASH_FLOOD: ("Detect sudden flash floods or water surges.", "flash_flood"),
@@ -109,11 +113,47 @@ class DetectedEvent:
     stream_url: Optional[str] = None
 
 
+class BoundedDict(OrderedDict):
+    """Dict capped at max_size entries, evicting the least recently used.
+    
+    Reads through get_fresh() and writes count as use. Evicted values are
+    passed to on_evict (e.g. to stop a dropped cloud stream).
+    """
+    
+    def __init__(self, max_size: int = 64, on_evict: Optional[Callable] = None):
+        super().__init__()
+        self.max_size = max_size
+        self.on_evict = on_evict
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            _, oldest = self.popitem(last=False)
+            if self.on_evict:
+                try:
+                    self.on_evict(oldest)
+                except Exception as e:
+                    print(f"[RTStream] Error releasing evicted entry: {e}")
+    
+    def get_fresh(self, key, default=None):
+        """Get a value and mark it as most recently used."""
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+
+def _stop(resource):
+    resource.stop()
+
+
 # ==================== RTSTREAM MONITOR ====================
 class RTStreamMonitor:
     """Wrapper for VideoDB RTStream real-time monitoring."""
     
     SAMPLE_STREAM = "rtsp://samples.rts.videodb.io:8554/floods"
+    MAX_TRACKED = 64  # Streams/indexes/events remembered before the oldest is dropped
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the monitor with VideoDB credentials."""
@@ -125,9 +165,12 @@ class RTStreamMonitor:
         self.conn = videodb.connect()
         self.coll = self.conn.get_collection()
         
-        self.active_streams = {}  # stream_id -> rtstream object
-        self.active_indexes = {}  # index_id -> scene_index object
-        self.event_ids = {}       # label -> event_id
+        # LRU-capped so a long-running session doesn't accumulate cloud handles;
+        # dropped streams/indexes are stopped
+        self.active_streams = BoundedDict(self.MAX_TRACKED, on_evict=_stop)  # stream_id -> rtstream object
+        self.active_indexes = BoundedDict(self.MAX_TRACKED, on_evict=_stop)  # index_id -> scene_index object
+        self.event_ids = BoundedDict(self.MAX_TRACKED)    # label -> event_id
+        self.scene_marks = BoundedDict(self.MAX_TRACKED)  # index_id -> end time of the newest scene returned
     
     def connect_stream(self, config: StreamConfig) -> str:
         """Connect to an RTSP stream and return stream ID."""
@@ -141,8 +184,9 @@ class RTStreamMonitor:
     
     def get_stream(self, stream_id: str):
         """Get an existing stream by ID."""
-        if stream_id in self.active_streams:
-            return self.active_streams[stream_id]
+        rtstream = self.active_streams.get_fresh(stream_id)
+        if rtstream is not None:
+            return rtstream
         rtstream = self.coll.get_rtstream(stream_id)
         self.active_streams[stream_id] = rtstream
         return rtstream
@@ -156,7 +200,7 @@ class RTStreamMonitor:
         if config.custom_prompt:
             prompt = config.custom_prompt
         else:
-            prompt = SCENARIO_PROMPTS.get(config.scenario, SCENARIO_PROMPTS[DetectionScenario.CUSTOM])
+            prompt = SCENARIO_PROMPTS[config.scenario]
         
         if on_status:
             on_status(f"Creating scene index for {config.scenario.value}...")
@@ -183,8 +227,9 @@ class RTStreamMonitor:
     
     def create_event(self, scenario: DetectionScenario, custom_prompt: Optional[str] = None) -> str:
         """Create an event for detection. Returns event ID."""
-        if scenario in self.event_ids:
-            return self.event_ids[scenario]
+        event_id = self.event_ids.get_fresh(scenario)
+        if event_id is not None:
+            return event_id
         
         event_prompt, label = SCENARIO_EVENTS.get(
             scenario, 
@@ -200,7 +245,7 @@ class RTStreamMonitor:
     
     def create_alert(self, index_id: str, event_id: str, webhook_url: str) -> str:
         """Create an alert to send to webhook when event is detected."""
-        scene_index = self.active_indexes.get(index_id)
+        scene_index = self.active_indexes.get_fresh(index_id)
         if not scene_index:
             raise ValueError(f"Index {index_id} not found")
         
@@ -212,13 +257,23 @@ class RTStreamMonitor:
     
     def get_recent_scenes(self, index_id: str, page_size: int = 5) -> list:
         """Get recently indexed scenes."""
-        scene_index = self.active_indexes.get(index_id)
+        scene_index = self.active_indexes.get_fresh(index_id)
         if not scene_index:
             return []
         
         scenes = scene_index.get_scenes(page_size=page_size)
         return scenes.get("scenes", []) if scenes else []
     
+    def get_new_scenes(self, index_id: str, page_size: int = 5) -> list:
+        """Get recent scenes not returned by a previous call for this index."""
+        scenes = self.get_recent_scenes(index_id, page_size)
+        mark = self.scene_marks.get(index_id)
+        if mark is not None:
+            scenes = [s for s in scenes if s.get("end", 0) > mark]
+        if scenes:
+            self.scene_marks[index_id] = max(mark or 0, max(s.get("end", 0) for s in scenes))
+        return scenes
+    
     def stop_monitoring(self, index_id: str):
         """Stop monitoring (pause scene indexing)."""
         if index_id in self.active_indexes:
@@ -244,4 +299,4 @@ class RTStreamMonitor:
 
 def get_scenario_prompt(scenario: DetectionScenario) -> str:
     """Get the default prompt for a scenario."""
-    return SCENARIO_PROMPTS.get(scenario, SCENARIO_PROMPTS[DetectionScenario.CUSTOM])
+    return SCENARIO_PROMPTS[scenario]
@@ -3,16 +3,125 @@ Twelve Labs API Client Wrapper
 
 Provides a simplified interface for video analysis using Twelve Labs.
 """
+import json
 import os
+import re
+import shutil
+import subprocess
+import tempfile
 import time
-from typing import Generator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import IO, Generator, Optional
 from twelvelabs import TwelveLabs
 
 
+# Moment lines in an analysis response, times as mm:ss or plain seconds:
+# "2:00-2:30: description (confidence)" / "120-150: description (confidence)"
+_PAT_MOMENT = re.compile(
+    r'(\d+:\d{2}|\d+(?:\.\d+)?)\s*[-–]\s*(\d+:\d{2}|\d+(?:\.\d+)?)\s*:\s*([^(]+)\s*\((\w+)\)'
+)
+# Any time-like token, for unstructured responses
+_PAT_TIME = re.compile(r'(\d+:\d{2}|\d+(?:\.\d+)?\s*(?:s|sec|seconds)?)')
+
+# "3: label" lines in a batched label_clips response
+_LABEL_LINE_RE = re.compile(r'^\s*(\d+)\s*[:.)]\s*(.+?)\s*$', re.MULTILINE)
+
+def _parse_time(time_str: str) -> float:
+    """Convert time string to seconds. Handles mm:ss, m:ss, h:mm:ss or plain seconds."""
+    time_str = time_str.strip()
+    if ':' not in time_str:
+        return float(time_str)
+    parts = time_str.split(':')
+    if len(parts) == 2:
+        mins, secs = parts
+        return float(mins) * 60 + float(secs)
+    if len(parts) == 3:  # h:mm:ss
+        hours, mins, secs = parts
+        return float(hours) * 3600 + float(mins) * 60 + float(secs)
+    return float(time_str)  # Malformed: raises ValueError like before
+
+
+# NVDEC decoders for the source codecs ffprobe reports
+CUVID_DECODERS = {"h264": "h264_cuvid", "hevc": "hevc_cuvid"}
+
+
+def _ffmpeg_lines(*args: str) -> str:
+    """Run an ffmpeg query command and return its stdout ('' if unavailable)."""
+    try:
+        return subprocess.run(["ffmpeg", "-hide_banner", *args], capture_output=True,
+                              text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+@lru_cache(maxsize=1)
+def _nvidia_ffmpeg() -> frozenset:
+    """CUVID decoders usable for a GPU decode/scale/encode pipeline.
+    
+    Empty when ffmpeg is missing or lacks CUDA hwaccel or the NVENC encoder.
+    """
+    if not shutil.which("ffmpeg"):
+        return frozenset()
+    if "cuda" not in _ffmpeg_lines("-hwaccels").split():
+        return frozenset()
+    if "h264_nvenc" not in _ffmpeg_lines("-encoders"):
+        return frozenset()
+    decoders = _ffmpeg_lines("-decoders")
+    return frozenset(name for name in CUVID_DECODERS.values() if name in decoders)
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_has_x264() -> bool:
+    """Whether the installed ffmpeg was built with the libx264 encoder."""
+    return "libx264" in _ffmpeg_lines("-encoders")
+
+
+def _cpu_encoder_args() -> list:
+    """ffmpeg video encoder options for CPU preprocessing.
+    
+    H.264 is several times smaller than MPEG-4 Part 2 at the same quality.
+    """
+    if _ffmpeg_has_x264():
+        return ["-c:v", "libx264", "-preset", "veryfast", "-crf", "28", "-pix_fmt", "yuv420p"]
+    return ["-c:v", "mpeg4", "-q:v", "5"]
+
+
+def _probe_video(file_path: str) -> Optional[dict]:
+    """Read codec, size, fps and duration of a video with ffprobe."""
+    if not shutil.which("ffprobe"):
+        return None
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=codec_name,width,height,r_frame_rate:format=duration",
+             "-of", "json", file_path],
+            capture_output=True, text=True, timeout=30, check=True
+        ).stdout
+        probe = json.loads(out)
+        stream = probe["streams"][0]
+        num, _, den = stream.get("r_frame_rate", "30/1").partition("/")
+        duration = probe.get("format", {}).get("duration")
+        return {
+            "codec": stream["codec_name"],
+            "width": int(stream["width"]),
+            "height": int(stream["height"]),
+            "fps": float(num) / float(den or 1),
+            "duration": float(duration) if duration else None,
+        }
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError, ZeroDivisionError):
+        return None
+
+
 class TwelveLabsClient:
     """Client wrapper for Twelve Labs video analysis API."""
     
     DEFAULT_INDEX_NAME = "surveillance_app_index"
+    ASSETS_CACHE_TTL = 30.0  # Seconds a listed-assets result is reused
+    INDEX_POLL_MAX_DELAY = 8.0  # Cap for the indexing status poll backoff
+    SPOOL_MAX_BYTES = 512 << 20  # Preprocessed uploads up to this size stay in RAM
+    MULTIPART_MIN_BYTES = 50 << 20  # Files from this size upload in concurrent chunks
+    UPLOAD_WORKERS = 6  # Concurrent chunk uploads for multipart
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the Twelve Labs client.
@@ -26,6 +135,7 @@ class TwelveLabsClient:
         
         self.client = TwelveLabs(api_key=self.api_key)
         self.index_id = None
+        self._assets_cache = None  # (monotonic time, assets) from get_indexed_assets
         self._ensure_index()
     
     def _ensure_index(self):
@@ -50,7 +160,8 @@ class TwelveLabsClient:
         self.index_id = index.id
         print(f"Created new index: {self.index_id}")
     
-    def preprocess_video(self, file_path: str, target_fps: int = 5, target_width: int = 640) -> str:
+    def preprocess_video(self, file_path: str, target_fps: int = 5, target_width: int = 640,
+                         use_ffmpeg: bool = True) -> str:
         """Preprocess video for faster upload and indexing.
         
         Reduces framerate and resolution to optimize for Twelve Labs.
@@ -59,12 +170,21 @@ class TwelveLabsClient:
             file_path: Path to original video
             target_fps: Target framerate (default 5fps)
             target_width: Target width in pixels (height scales proportionally)
+            use_ffmpeg: Set False to go straight to the OpenCV path, e.g. when
+                preprocess_video_stream already tried the ffmpeg pipelines
             
         Returns:
             Path to preprocessed video (temp file)
         """
         import cv2
-        import tempfile
+        
+        pipelines = self._ffmpeg_pipelines(file_path, target_fps, target_width) if use_ffmpeg else ()
+        for args in pipelines:
+            fd, output_path = tempfile.mkstemp(suffix='.mp4')
+            os.close(fd)
+            if self._run_ffmpeg(args + [output_path]):
+                return output_path
+            os.remove(output_path)
         
         cap = cv2.VideoCapture(file_path)
         if not cap.isOpened():
@@ -87,26 +207,31 @@ class TwelveLabsClient:
         
         # Create temp output file
         fd, output_path = tempfile.mkstemp(suffix='.mp4')
-        import os
         os.close(fd)
         
-        writer = cv2.VideoWriter(
-            output_path,
-            cv2.VideoWriter_fourcc(*'mp4v'),
-            target_fps,
-            (new_width, new_height)
-        )
+        # Prefer H.264; not every OpenCV build can encode it, so fall back to MPEG-4
+        for fourcc in ('avc1', 'mp4v'):
+            writer = cv2.VideoWriter(
+                output_path,
+                cv2.VideoWriter_fourcc(*fourcc),
+                target_fps,
+                (new_width, new_height)
+            )
+            if writer.isOpened():
+                break
+            writer.release()
         
         frame_count = 0
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Only keep every Nth frame
+            # Only keep every Nth frame; grab() skips the BGR conversion of the rest
             if frame_count % frame_skip == 0:
+                ret, frame = cap.read()
+                if not ret:
+                    break
                 resized = cv2.resize(frame, (new_width, new_height))
                 writer.write(resized)
+            elif not cap.grab():
+                break
             
             frame_count += 1
         
@@ -114,16 +239,170 @@ class TwelveLabsClient:
         writer.release()
         
         # Log file size comparison
-        import os
-        orig_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-        new_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
-        reduction = (1 - new_size / orig_size) * 100 if orig_size > 0 else 0
-        
-        print(f"[Preprocess] {orig_fps:.0f}fps → {target_fps}fps, {orig_width}x{orig_height} → {new_width}x{new_height}")
-        print(f"[Preprocess] File size: {orig_size:.1f}MB → {new_size:.1f}MB ({reduction:.0f}% smaller)")
+        orig_size = os.stat(file_path).st_size
+        new_size = os.stat(output_path).st_size
+        reduction = (1 - new_size / orig_size) * 100 if orig_size else 0
+        print(f"[Preprocess] {orig_fps:.0f}fps → {target_fps}fps, {orig_width}x{orig_height} → {new_width}x{new_height}, "
+              f"{orig_size / 2**20:.1f}MB → {new_size / 2**20:.1f}MB ({reduction:.0f}% smaller)")
         
         return output_path
     
+    def preprocess_videos(self, paths: list, target_fps: int = 5, target_width: int = 640) -> list:
+        """Preprocess several videos with a single ffmpeg run.
+        
+        The inputs are joined with the concat demuxer and split back into one
+        output per input (cut points forced to keyframes), so decoder/encoder
+        setup is paid once instead of per clip. Falls back to preprocess_video
+        per path when the inputs can't be concatenated (different codec or
+        size, unknown duration) or ffmpeg is unavailable.
+        
+        Args:
+            paths: Paths to the original videos
+            target_fps: Target framerate (default 5fps)
+            target_width: Target width in pixels (height scales proportionally)
+            
+        Returns:
+            Paths to the preprocessed videos (temp files), in input order
+        """
+        def one_by_one():
+            return [self.preprocess_video(path, target_fps, target_width) for path in paths]
+        
+        if len(paths) < 2 or not shutil.which("ffmpeg"):
+            return one_by_one()
+        
+        infos = [_probe_video(path) for path in paths]
+        if (any(info is None or not info["duration"] for info in infos)
+                or len({(i["codec"], i["width"], i["height"]) for i in infos}) != 1):
+            return one_by_one()
+        
+        # Output boundaries: cumulative input durations, except the last
+        cuts, t = [], 0.0
+        for info in infos[:-1]:
+            t += info["duration"]
+            cuts.append(f"{t:.3f}")
+        
+        work_dir = tempfile.mkdtemp(prefix="preprocess_")
+        try:
+            list_path = os.path.join(work_dir, "inputs.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                for path in paths:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            
+            cmd = [
+                "ffmpeg", "-y", "-v", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-vf", f"fps={target_fps},scale={target_width}:-2",
+                *_cpu_encoder_args(),
+                "-force_key_frames", ",".join(cuts),
+                "-an",
+                "-f", "segment", "-segment_times", ",".join(cuts), "-reset_timestamps", "1",
+                os.path.join(work_dir, "out_%03d.mp4"),
+            ]
+            if not self._run_ffmpeg(cmd):
+                return one_by_one()
+            
+            segments = sorted(name for name in os.listdir(work_dir) if name.startswith("out_"))
+            if len(segments) != len(paths):
+                print(f"[Preprocess] Expected {len(paths)} segments, got {len(segments)}; "
+                      "preprocessing individually")
+                return one_by_one()
+            
+            outputs = []
+            for name in segments:
+                fd, output_path = tempfile.mkstemp(suffix='.mp4')
+                os.close(fd)
+                os.replace(os.path.join(work_dir, name), output_path)
+                outputs.append(output_path)
+            print(f"[Preprocess] {len(paths)} videos → {target_fps}fps, width {target_width} (one ffmpeg run)")
+            return outputs
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def preprocess_video_stream(self, file_path: str, target_fps: int = 5,
+                                target_width: int = 640) -> Optional[IO[bytes]]:
+        """Preprocess like preprocess_video, but return the result as a file object.
+        
+        ffmpeg writes fragmented MP4 to a pipe that is spooled in memory (on
+        disk only past SPOOL_MAX_BYTES), so no temp file is written and then
+        read back just to upload it.
+        
+        Returns:
+            Readable file object positioned at the start, or None if ffmpeg
+            is unavailable or every pipeline failed (use
+            preprocess_video(..., use_ffmpeg=False) then)
+        """
+        stream_args = ["-f", "mp4", "-movflags", "frag_keyframe+empty_moov", "pipe:1"]
+        for args in self._ffmpeg_pipelines(file_path, target_fps, target_width):
+            spool = self._spool_ffmpeg(args + stream_args)
+            if spool is not None:
+                return spool
+        return None
+    
+    def _ffmpeg_pipelines(self, file_path: str, target_fps: int, target_width: int):
+        """Yield ffmpeg argument lists (minus the output) to try, fastest first.
+        
+        GPU: NVDEC decode + resize, fps filter and NVENC encode, when the
+        installed ffmpeg supports them for this codec. CPU: the fps filter drops
+        frames right after decode, before scaling and encoding, with no
+        per-frame Python work.
+        """
+        if not shutil.which("ffmpeg"):
+            return
+        
+        decoders = _nvidia_ffmpeg()
+        info = _probe_video(file_path) if decoders else None
+        if info and CUVID_DECODERS.get(info["codec"]) in decoders:
+            # Same output geometry as the OpenCV path (even height, aspect kept)
+            new_height = int(info["height"] * target_width / info["width"])
+            new_height += new_height % 2
+            print(f"[Preprocess] GPU: {info['fps']:.0f}fps → {target_fps}fps, "
+                  f"{info['width']}x{info['height']} → {target_width}x{new_height}")
+            yield [
+                "ffmpeg", "-y", "-v", "error",
+                "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
+                "-c:v", CUVID_DECODERS[info["codec"]],
+                "-resize", f"{target_width}x{new_height}",
+                "-i", file_path,
+                "-vf", f"fps={target_fps}",
+                "-c:v", "h264_nvenc", "-preset", "p1", "-b:v", "1M",
+                "-an",
+            ]
+        
+        print(f"[Preprocess] ffmpeg: → {target_fps}fps, width {target_width}")
+        yield [
+            "ffmpeg", "-y", "-v", "error",
+            "-i", file_path,
+            "-vf", f"fps={target_fps},scale={target_width}:-2",  # -2: even height, aspect kept
+            *_cpu_encoder_args(),
+            "-an",
+        ]
+    
+    def _run_ffmpeg(self, cmd: list) -> bool:
+        """Run an ffmpeg command that writes to a file; False on failure."""
+        try:
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+            return True
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"[Preprocess] ffmpeg failed, trying next method: {e}")
+            return False
+    
+    def _spool_ffmpeg(self, cmd: list) -> Optional[IO[bytes]]:
+        """Run an ffmpeg command that writes to stdout, spooling the output; None on failure."""
+        spool = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_BYTES)
+        try:
+            # stderr is discarded so it can't fill up and stall ffmpeg while stdout is drained
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+                shutil.copyfileobj(proc.stdout, spool, 1 << 20)
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"[Preprocess] ffmpeg failed, trying next method: {e}")
+            spool.close()
+            return None
+        spool.seek(0)
+        return spool
+    
     def upload_and_index_video(self, file_path: str, callback=None, preprocess: bool = True) -> str:
         """Upload a video file and index it.
         
@@ -135,34 +414,47 @@ class TwelveLabsClient:
         Returns:
             indexed_asset_id: The ID of the indexed asset
         """
-        import os
-        
         # Preprocess video for faster upload/indexing
         preprocessed_path = None
+        stream = None
         if preprocess:
             if callback:
                 callback("Optimizing video (reducing framerate)...")
-            preprocessed_path = self.preprocess_video(file_path)
-            upload_path = preprocessed_path
-        else:
-            upload_path = file_path
+            stream = self.preprocess_video_stream(file_path)
+            if stream is None:
+                # ffmpeg is missing or already failed; don't run its pipelines again
+                preprocessed_path = self.preprocess_video(file_path, use_ffmpeg=False)
+        upload_path = preprocessed_path or file_path
         
         if callback:
             callback("Uploading video...")
         
         # Upload the file
-        with open(upload_path, "rb") as f:
-            asset = self.client.assets.create(
-                method="direct",
-                file=f
-            )
-        
-        # Clean up preprocessed temp file
-        if preprocessed_path and preprocessed_path != file_path:
-            try:
-                os.remove(preprocessed_path)
-            except:
-                pass
+        try:
+            if stream is not None:
+                with stream:
+                    stream.seek(0, os.SEEK_END)
+                    size = stream.tell()
+                    stream.seek(0)
+                    if size >= self.MULTIPART_MIN_BYTES:
+                        # Multipart upload reads from a path, so large outputs go to a temp file
+                        preprocessed_path = self._spool_to_file(stream)
+                        asset_id = self._upload_file(preprocessed_path, callback)
+                    else:
+                        name = os.path.splitext(os.path.basename(file_path))[0] + ".mp4"
+                        asset_id = self.client.assets.create(
+                            method="direct",
+                            file=(name, stream, "video/mp4")
+                        ).id
+            else:
+                asset_id = self._upload_file(upload_path, callback)
+        finally:
+            # Clean up preprocessed temp file
+            if preprocessed_path and preprocessed_path != file_path:
+                try:
+                    os.remove(preprocessed_path)
+                except:
+                    pass
         
         if callback:
             callback(f"Upload complete. Indexing...")
@@ -170,10 +462,11 @@ class TwelveLabsClient:
         # Index the asset
         indexed_asset = self.client.indexes.indexed_assets.create(
             index_id=self.index_id,
-            asset_id=asset.id
+            asset_id=asset_id
         )
         
-        # Wait for indexing to complete
+        # Wait for indexing to complete: poll soon, then back off (0.5s -> 8s)
+        delay = 0.5
         while True:
             indexed_asset = self.client.indexes.indexed_assets.retrieve(
                 index_id=self.index_id,
@@ -184,17 +477,48 @@ class TwelveLabsClient:
                 callback(f"Indexing: {indexed_asset.status}")
             
             if indexed_asset.status == "ready":
+                self._assets_cache = None  # New asset: relist on next search
                 break
             elif indexed_asset.status == "failed":
                 raise RuntimeError("Video indexing failed")
             
-            time.sleep(3)
+            time.sleep(delay)
+            delay = min(self.INDEX_POLL_MAX_DELAY, delay * 1.5)
         
         if callback:
             callback("Ready for analysis!")
         
         return indexed_asset.id
     
+    def _spool_to_file(self, stream: IO[bytes]) -> str:
+        """Copy a spooled preprocess result to a temp .mp4 file and return its path."""
+        fd, path = tempfile.mkstemp(suffix='.mp4')
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(stream, f, 1 << 20)
+        return path
+    
+    def _upload_file(self, path: str, callback=None) -> str:
+        """Upload a file as an asset and return its ID.
+        
+        Large files go through the SDK's multipart upload, which PUTs chunks
+        to presigned URLs concurrently; small ones use a single direct upload.
+        """
+        multipart = getattr(self.client, "multipart_upload", None)
+        if os.stat(path).st_size >= self.MULTIPART_MIN_BYTES and hasattr(multipart, "upload_file"):
+            def progress(p):
+                if callback:
+                    callback(f"Uploading video... {p.percentage:.0f}%")
+            
+            result = multipart.upload_file(path, max_workers=self.UPLOAD_WORKERS,
+                                           progress_callback=progress)
+            return result.asset_id
+        
+        with open(path, "rb") as f:
+            return self.client.assets.create(
+                method="direct",
+                file=f
+            ).id
+    
     def analyze(self, indexed_asset_id: str, prompt: str) -> Generator[str, None, None]:
         """Analyze a video with a natural language prompt.
         
@@ -259,21 +583,32 @@ class TwelveLabsClient:
             List of dicts with start, end, confidence, video_id, query
         """
         try:
-            # Get the most recent indexed asset
-            assets = self.get_indexed_assets()
-            if not assets:
-                print("No indexed assets found")
-                return []
-            
-            # Use the first/most recent asset
-            asset = assets[0]
-            asset_id = getattr(asset, 'id', None)
+            asset_id = self._latest_asset_id()
             if not asset_id:
-                print("Could not get asset ID")
                 return []
+            return self._search_asset(asset_id, query, top_k)
             
-            # Use analyze to find moments matching the query
-            prompt = f"""Analyze this entire video carefully and find ALL moments where: {query}
+        except Exception as e:
+            print(f"Search error: {e}")
+            return []
+    
+    def _latest_asset_id(self) -> Optional[str]:
+        """ID of the most recent indexed asset, or None if there is none."""
+        assets = self.get_indexed_assets()
+        if not assets:
+            print("No indexed assets found")
+            return None
+        
+        # Use the first/most recent asset
+        asset_id = getattr(assets[0], 'id', None)
+        if not asset_id:
+            print("Could not get asset ID")
+        return asset_id
+    
+    def _search_asset(self, asset_id: str, query: str, top_k: int) -> list:
+        """Find moments matching a query in one indexed asset."""
+        # Use analyze to find moments matching the query
+        prompt = f"""Analyze this entire video carefully and find ALL moments where: {query}
 
 IMPORTANT: List EVERY occurrence, even if the same event happens multiple times. Do not summarize or combine repeated events.
 
@@ -288,56 +623,29 @@ Example: 15-22: Person near door (high)
 
 If no relevant moments found, respond with "NONE"."""
 
-            result = self.analyze_sync(asset_id, prompt)
-            
-            # Parse the response to extract moments
-            moments = self._parse_analysis_moments(result, query, asset_id)
-            return moments[:top_k]
-            
-        except Exception as e:
-            print(f"Search error: {e}")
-            return []
+        result = self.analyze_sync(asset_id, prompt)
+        
+        # Parse the response to extract moments
+        return self._parse_analysis_moments(result, query, asset_id, limit=top_k)
     
-    def _parse_analysis_moments(self, analysis_text: str, query: str, video_id: str) -> list:
-        """Parse analysis response to extract moment timestamps."""
+    def _parse_analysis_moments(self, analysis_text: str, query: str, video_id: str,
+                                limit: Optional[int] = None) -> list:
+        """Parse analysis response to extract moment timestamps.
+        
+        Scans the text once, stopping after limit moments when given.
+        """
         moments = []
         
         if not analysis_text or "NONE" in analysis_text.upper():
             return moments
         
-        import re
-        
-        def parse_time(time_str: str) -> float:
-            """Convert time string to seconds. Handles mm:ss, m:ss, or plain seconds."""
-            time_str = time_str.strip()
-            if ':' in time_str:
-                parts = time_str.split(':')
-                if len(parts) == 2:
-                    mins = float(parts[0])
-                    secs = float(parts[1])
-                    return mins * 60 + secs
-                elif len(parts) == 3:  # h:mm:ss
-                    hours = float(parts[0])
-                    mins = float(parts[1])
-                    secs = float(parts[2])
-                    return hours * 3600 + mins * 60 + secs
-            return float(time_str)
-        
-        # Pattern 1: seconds format: 120-150: description (confidence)
-        pattern_seconds = r'(\d+(?:\.\d+)?)\s*[-–]\s*(\d+(?:\.\d+)?)\s*:\s*([^(]+)\s*\((\w+)\)'
-        
-        # Pattern 2: mm:ss format: 2:00-2:30: description (confidence)
-        pattern_mmss = r'(\d+:\d{2})\s*[-–]\s*(\d+:\d{2})\s*:\s*([^(]+)\s*\((\w+)\)'
-        
-        # Try mm:ss pattern first (more specific)
-        matches = re.findall(pattern_mmss, analysis_text)
-        if not matches:
-            matches = re.findall(pattern_seconds, analysis_text)
-        
-        for match in matches:
+        for match in _PAT_MOMENT.finditer(analysis_text):
+            if limit is not None and len(moments) >= limit:
+                break
+            match = match.groups()
             try:
-                start = parse_time(match[0])
-                end = parse_time(match[1])
+                start = _parse_time(match[0])
+                end = _parse_time(match[1])
                 label = match[2].strip()
                 conf_str = match[3].lower()
                 
@@ -357,12 +665,11 @@ If no relevant moments found, respond with "NONE"."""
         # If no structured matches, try to extract any time ranges mentioned
         if not moments and len(analysis_text) > 20 and "NONE" not in analysis_text.upper():
             # Try to find any time-like patterns in the text
-            time_pattern = r'(\d+:\d{2}|\d+(?:\.\d+)?\s*(?:s|sec|seconds)?)'
-            times = re.findall(time_pattern, analysis_text)
+            times = _PAT_TIME.findall(analysis_text)
             if len(times) >= 2:
                 try:
-                    start = parse_time(times[0].replace('s', '').replace('sec', '').replace('seconds', '').strip())
-                    end = parse_time(times[1].replace('s', '').replace('sec', '').replace('seconds', '').strip())
+                    start = _parse_time(times[0].replace('s', '').replace('sec', '').replace('seconds', '').strip())
+                    end = _parse_time(times[1].replace('s', '').replace('sec', '').replace('seconds', '').strip())
                     moments.append({
                         'start': start,
                         'end': end,
@@ -397,10 +704,30 @@ If no relevant moments found, respond with "NONE"."""
         Returns:
             Combined list of moments from all queries
         """
+        if not queries:
+            return []
+        
+        try:
+            # Resolve the asset once rather than once per query
+            asset_id = self._latest_asset_id()
+        except Exception as e:
+            print(f"Search error: {e}")
+            return []
+        if not asset_id:
+            return []
+        
+        def search(query):
+            try:
+                return self._search_asset(asset_id, query, top_k_per_query)
+            except Exception as e:
+                print(f"Search error: {e}")
+                return []
+        
+        # Each query is an independent, network-bound analyze call: run them concurrently
         all_moments = []
-        for query in queries:
-            moments = self.search_moments(query, top_k=top_k_per_query)
-            all_moments.extend(moments)
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as pool:
+            for moments in pool.map(search, queries):
+                all_moments.extend(moments)
         return all_moments
     
     def label_clip(self, indexed_asset_id: str, start: float, end: float) -> str:
@@ -414,15 +741,44 @@ If no relevant moments found, respond with "NONE"."""
         Returns:
             Short descriptive label (3-7 words)
         """
+        return self.label_clips(indexed_asset_id, [(start, end)])[0]
+    
+    def label_clips(self, indexed_asset_id: str, ranges: list) -> list:
+        """Generate short labels for several clips of one video in a single request.
+        
+        Args:
+            indexed_asset_id: The ID of the indexed video
+            ranges: List of (start, end) times in seconds
+            
+        Returns:
+            One label (3-7 words) per range, in order; "Activity detected"
+            for any range the response does not cover
+        """
+        labels = ["Activity detected"] * len(ranges)
+        if not ranges:
+            return labels
+        
         try:
-            prompt = f"In 5 words or less, describe what happens between {start:.1f}s and {end:.1f}s."
+            listed = " ".join(f"{i}) {start:.1f}-{end:.1f}s" for i, (start, end) in enumerate(ranges, 1))
+            prompt = (
+                "For each of these time ranges, describe what happens in 5 words or less. "
+                "Return exactly one line per range formatted as 'N: label'. "
+                f"Ranges: {listed}"
+            )
             result = self.analyze_sync(indexed_asset_id, prompt)
-            # Truncate to first sentence/7 words
-            words = result.split()[:7]
-            return ' '.join(words)
+            
+            matches = _LABEL_LINE_RE.findall(result)
+            if not matches and len(ranges) == 1:
+                matches = [("1", result)]  # Unnumbered answer for a single clip
+            for number, label in matches:
+                idx = int(number) - 1
+                if 0 <= idx < len(labels):
+                    # Truncate to 7 words
+                    labels[idx] = ' '.join(label.split()[:7])
         except Exception as e:
             print(f"Label generation error: {e}")
-            return "Activity detected"
+        
+        return labels
     
     def get_indexed_assets(self) -> list:
         """Get list of all indexed assets.
@@ -430,10 +786,24 @@ If no relevant moments found, respond with "NONE"."""
         Returns:
             List of indexed asset objects
         """
+        cached = self._assets_cache
+        if cached is not None and time.monotonic() - cached[0] < self.ASSETS_CACHE_TTL:
+            return list(cached[1])
+        
         try:
-            assets = self.client.indexes.indexed_assets.list(index_id=self.index_id)
+            assets = list(self.client.indexes.indexed_assets.list(index_id=self.index_id))
+            self._assets_cache = (time.monotonic(), assets)
             return list(assets)
         except Exception as e:
             print(f"Error listing assets: {e}")
             return []
 
+
+@lru_cache(maxsize=4)
+def get_client(api_key: Optional[str] = None) -> TwelveLabsClient:
+    """Get or create the shared client for an API key.
+    
+    Reusing one instance keeps the SDK's HTTP connections alive between
+    uploads/searches and skips the index lookup on every worker run.
+    """
+    return TwelveLabsClient(api_key=api_key)
@@ -3,8 +3,94 @@ Zone Intrusion Detection
 
 Allows users to define restricted zones and detect when persons enter them.
 """
+import ctypes
+import os
+import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Callable
+
+import cv2
+import numpy as np
+
+_now = time.time  # Bound once; check_intrusions runs every frame
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in that leaves the function as plain Python."""
+        return lambda fn: fn
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+    cp = None
+
+# Zone coordinates are float32 throughout so the kernel has one concrete signature
+@njit("boolean(float32, float32, float32[::1], float32[::1], float32[::1], float32[::1], float32[::1])",
+      cache=True, boundscheck=False, fastmath=True)
+def _pip(x, y, xs, ys, ys2, dx, dy):
+    """Crossing-number point-in-polygon test over an edge table.
+    
+    Edge i starts at (xs[i], ys[i]) and ends at height ys2[i]; (dx[i], dy[i]) is
+    its direction flipped so dy >= 0. The point is left of a straddling edge
+    when the cross product is positive - no division, no horizontal-edge case.
+    """
+    inside = False
+    for i in range(xs.shape[0]):
+        yi = ys[i]
+        cross = dx[i] * (y - yi) - (x - xs[i]) * dy[i]
+        inside ^= ((yi > y) != (ys2[i] > y)) & (cross > 0)
+    return inside
+
+# One thread per (point, zone) pair; walks that zone's slice of the flat edge table
+_PNPOLY_CUDA_SRC = r'''
+extern "C" __global__
+void pnpoly(const float* cx, const float* cy, int n_points,
+            const float* xs, const float* ys, const float* ys2,
+            const float* dx, const float* dy, const int* offsets, int n_zones, unsigned char* out)
+{
+    int tid = blockDim.x * blockIdx.x + threadIdx.x;
+    if (tid >= n_points * n_zones) return;
+    int p = tid / n_zones;
+    int z = tid - p * n_zones;
+    float x = cx[p], y = cy[p];
+    bool inside = false;
+    for (int i = offsets[z]; i < offsets[z + 1]; i++) {
+        float yi = ys[i];
+        float cross = dx[i] * (y - yi) - (x - xs[i]) * dy[i];
+        inside ^= ((yi > y) != (ys2[i] > y)) & (cross > 0.0f);
+    }
+    out[tid] = inside;
+}
+'''
+_pnpoly_cuda = cp.RawKernel(_PNPOLY_CUDA_SRC, "pnpoly") if CUPY_AVAILABLE else None
+
+def _load_pip_lib():
+    """Load the optional native batch kernel built from _pip.c, if it was compiled."""
+    name = "_pip.dll" if os.name == "nt" else "_pip.so"
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    if not os.path.exists(path):
+        return None
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError as e:
+        print(f"[Zones] Could not load {name}: {e}")
+        return None
+    # cx, cy, n_points, xs, ys, ys2, dx, dy, n_edges, out
+    lib.pip_batch.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+                              ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+                              ctypes.c_void_p, ctypes.c_void_p,
+                              ctypes.c_int, ctypes.c_void_p]
+    lib.pip_batch.restype = ctypes.c_int
+    return lib
+
+_pip_lib = _load_pip_lib()
 
 @dataclass
 class Zone:
@@ -13,78 +99,313 @@ class Zone:
     enabled: bool = True
     color: Tuple[int, int, int] = (0, 0, 255)  # Red by default
     
+    # Struct-of-arrays edge table, rebuilt by set_points(); _xs/_ys/_xs2/_ys2/_dx/_dy
+    # are contiguous rows of the single (6, N) _edges block
+    _edges: np.ndarray = field(init=False, repr=False, compare=False)
+    _xs: np.ndarray = field(init=False, repr=False, compare=False)
+    _ys: np.ndarray = field(init=False, repr=False, compare=False)
+    _xs2: np.ndarray = field(init=False, repr=False, compare=False)
+    _ys2: np.ndarray = field(init=False, repr=False, compare=False)
+    _dx: np.ndarray = field(init=False, repr=False, compare=False)  # Edge direction, flipped so _dy >= 0
+    _dy: np.ndarray = field(init=False, repr=False, compare=False)
+    _bbox: Tuple[float, float, float, float] = field(init=False, repr=False, compare=False)
+    _contour: np.ndarray = field(init=False, repr=False, compare=False)  # int32 (N,1,2) for cv2
+    _edge_list: Tuple[Tuple[int, int, int, int, int], ...] = field(init=False, repr=False, compare=False)
+    _contains: Callable[[float, float], bool] = field(init=False, repr=False, compare=False)
+    _edge_ptrs: Tuple[int, ...] = field(init=False, repr=False, compare=False)  # Row addresses for _pip_lib
+    
+    def __post_init__(self):
+        self.set_points(self.points)
+    
+    def set_points(self, points: List[Tuple[int, int]]):
+        """Replace the polygon vertices and rebuild the cached edge arrays."""
+        self.points = points
+        pts = np.asarray(points, np.float32).reshape(-1, 2)
+        edges = np.empty((6, len(pts)), np.float32)
+        edges[:2] = pts.T
+        # Second endpoint of each edge (vertex i -> i+1, wrapping)
+        edges[2:4] = np.roll(edges[:2], -1, axis=1)
+        # Direction oriented upward, so "left of the edge" is just cross > 0
+        edges[4:] = edges[2:4] - edges[:2]
+        edges[4:, edges[5] < 0] *= -1
+        self._edges = edges
+        self._xs, self._ys, self._xs2, self._ys2, self._dx, self._dy = edges
+        self._edge_ptrs = tuple(row.ctypes.data for row in (self._xs, self._ys, self._ys2, self._dx, self._dy))
+        self._contour = np.asarray(points, np.int32).reshape(-1, 1, 2)
+        # Bounding box (xmin, ymin, xmax, ymax) for cheap rejection
+        if len(pts):
+            self._bbox = (float(self._xs.min()), float(self._ys.min()),
+                          float(self._xs.max()), float(self._ys.max()))
+        else:
+            self._bbox = (0.0, 0.0, -1.0, -1.0)
+        # Same edge table as native Python numbers, (xi, yi, yj, dx, dy) per edge,
+        # for the scalar tests. Vertices stay ints (floats only if given floats),
+        # so the cross products are exact
+        verts = np.asarray(points).reshape(-1, 2).tolist()
+        edge_list = []
+        for (xi, yi), (xj, yj) in zip(verts, verts[1:] + verts[:1]):
+            dx, dy = xj - xi, yj - yi
+            if dy < 0:
+                dx, dy = -dx, -dy
+            edge_list.append((xi, yi, yj, dx, dy))
+        self._edge_list = tuple(edge_list)
+        # Triangles and quads (most drawn zones) get the same test unrolled
+        if len(edge_list) == 3:
+            self._contains = self._contains_tri
+        elif len(edge_list) == 4:
+            self._contains = self._contains_quad
+        else:
+            self._contains = self._contains_poly
+    
+    def contains_points(self, cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        """Crossing-number test for many points at once.
+        
+        Args:
+            cx, cy: 1-D arrays of point coordinates
+            
+        Returns:
+            Boolean array, True where the point is inside the polygon
+        """
+        if len(self._xs) < 3:
+            return np.zeros(len(cx), dtype=bool)
+        xmin, ymin, xmax, ymax = self._bbox
+        if not ((cx >= xmin) & (cx <= xmax) & (cy >= ymin) & (cy <= ymax)).any():
+            return np.zeros(len(cx), dtype=bool)
+        if _pip_lib is not None:
+            cx = np.ascontiguousarray(cx, np.float32)
+            cy = np.ascontiguousarray(cy, np.float32)
+            out = np.empty(len(cx), np.uint8)
+            _pip_lib.pip_batch(cx.ctypes.data, cy.ctypes.data, len(cx),
+                               *self._edge_ptrs, len(self._xs), out.ctypes.data)
+            return out.view(bool)
+        cx = cx[:, None]
+        cy = cy[:, None]
+        ys = self._ys
+        # Edges straddling each point's horizontal ray, with the point to their left
+        cond = (ys > cy) != (self._ys2 > cy)
+        cross = self._dx * (cy - ys) - (cx - self._xs) * self._dy
+        crossings = (cond & (cross > 0)).astype(np.uint8)
+        return np.bitwise_xor.reduce(crossings, axis=1).astype(bool)
+    
     def contains_point(self, x: int, y: int) -> bool:
-        """Check if point is inside the polygon using ray casting."""
-        n = len(self.points)
-        if n < 3:
+        """Check if point is inside the polygon."""
+        if len(self._xs) < 3:
             return False
+        xmin, ymin, xmax, ymax = self._bbox
+        if x < xmin or x > xmax or y < ymin or y > ymax:
+            return False
+        return self._contains(x, y)
+    
+    # Every path (these, _pip, the batch kernels) uses the same half-open crossing
+    # rule: an edge counts when it straddles y and the point is strictly left of it
+    def _contains_tri(self, x, y) -> bool:
+        """Crossing test unrolled for three edges."""
+        (x1, y1, v1, dx1, dy1), (x2, y2, v2, dx2, dy2), (x3, y3, v3, dx3, dy3) = self._edge_list
+        return ((((y1 > y) != (v1 > y)) and dx1 * (y - y1) - (x - x1) * dy1 > 0)
+                ^ (((y2 > y) != (v2 > y)) and dx2 * (y - y2) - (x - x2) * dy2 > 0)
+                ^ (((y3 > y) != (v3 > y)) and dx3 * (y - y3) - (x - x3) * dy3 > 0))
+    
+    def _contains_quad(self, x, y) -> bool:
+        """Crossing test unrolled for four edges."""
+        ((x1, y1, v1, dx1, dy1), (x2, y2, v2, dx2, dy2),
+         (x3, y3, v3, dx3, dy3), (x4, y4, v4, dx4, dy4)) = self._edge_list
+        return ((((y1 > y) != (v1 > y)) and dx1 * (y - y1) - (x - x1) * dy1 > 0)
+                ^ (((y2 > y) != (v2 > y)) and dx2 * (y - y2) - (x - x2) * dy2 > 0)
+                ^ (((y3 > y) != (v3 > y)) and dx3 * (y - y3) - (x - x3) * dy3 > 0)
+                ^ (((y4 > y) != (v4 > y)) and dx4 * (y - y4) - (x - x4) * dy4 > 0))
+    
+    def _contains_poly(self, x, y) -> bool:
+        """General polygon: crossing-number test."""
+        if NUMBA_AVAILABLE:
+            return _pip(np.float32(x), np.float32(y), self._xs, self._ys, self._ys2, self._dx, self._dy)
         inside = False
-        p1x, p1y = self.points[0]
-        for i in range(1, n + 1):
-            p2x, p2y = self.points[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
+        for xi, yi, yj, dx, dy in self._edge_list:
+            if ((yi > y) != (yj > y)) and dx * (y - yi) - (x - xi) * dy > 0:
+                inside = not inside
         return inside
 
 class ZoneManager:
     """Manages restricted zones and checks for intrusions."""
     
-    def __init__(self):
+    GRID_CELL_PX = 32  # Side of a spatial-index cell in pixels
+    GPU_MIN_WORK = 100_000  # Point x edge pairs below which the CPU path wins
+    
+    def __init__(self, backend: str = "cpu"):
+        """
+        Args:
+            backend: "cpu", or "cuda" to test large batches on the GPU via CuPy
+        """
+        if backend == "cuda" and not CUPY_AVAILABLE:
+            print("[Zones] CuPy not installed - using CPU backend")
+            backend = "cpu"
+        self.backend = backend
         self.zones: Dict[str, Zone] = {}
-        self.intrusion_cooldown: Dict[str, float] = {}  # zone_name -> last_alert_time
         self.cooldown_seconds = 10.0  # Don't alert again for 10 seconds
+        # Zones are numbered in insertion order; per-zone state lives in arrays indexed by id
+        self._zone_names: List[str] = []
+        self._zone_ids: Dict[str, int] = {}
+        self._cooldown = np.zeros(0, np.float64)  # zone id -> last_alert_time
+        self._grid: Dict[Tuple[int, int], List[int]] = {}  # cell -> ids of zones overlapping it
+        # Enabled zones with a usable polygon, rebuilt on add/remove/set_enabled
+        self._active: Tuple[Tuple[str, Zone], ...] = ()
+        self._active_mask = np.zeros(0, dtype=bool)  # zone id -> in _active
+        self._n_edges = 0
+        self._centers_buf = np.empty((64, 2), np.float32)  # Person centers, reused every frame
+        # Device-side copies for the CUDA backend, kept across frames
+        self._gpu_edges = None
+        self._gpu_offsets = None
+        self._gpu_cx = None
+        self._gpu_cy = None
     
     def add_zone(self, name: str, points: List[Tuple[int, int]], color=(0,0,255)) -> Zone:
         zone = Zone(name=name, points=points, color=color)
         self.zones[name] = zone
+        self._rebuild_index()
         return zone
     
     def remove_zone(self, name: str):
         if name in self.zones:
             del self.zones[name]
+            self._rebuild_index()
+    
+    def set_zone_points(self, name: str, points: List[Tuple[int, int]]):
+        """Move/reshape an existing zone, keeping the spatial index in sync."""
+        if name in self.zones:
+            self.zones[name].set_points(points)
+            self._rebuild_index()
+    
+    def set_enabled(self, name: str, enabled: bool):
+        """Turn a zone on or off; use this rather than setting zone.enabled directly."""
+        if name in self.zones:
+            self.zones[name].enabled = enabled
+            self._rebuild_active()
+    
+    def _rebuild_active(self):
+        self._active = tuple((name, zone) for name, zone in self.zones.items()
+                             if zone.enabled and len(zone.points) >= 3)
+        active = {name for name, _ in self._active}
+        self._active_mask = np.array([name in active for name in self._zone_names], dtype=bool)
+    
+    @property
+    def intrusion_cooldown(self) -> Dict[str, float]:
+        """Last alert time per zone name."""
+        return {name: float(t) for name, t in zip(self._zone_names, self._cooldown) if t}
+    
+    def _rebuild_index(self):
+        """Renumber zones (carrying cooldowns over) and rasterize their bounding boxes into the cell grid."""
+        last_alert = self.intrusion_cooldown
+        self._zone_names = list(self.zones)
+        self._zone_ids = {name: i for i, name in enumerate(self._zone_names)}
+        self._cooldown = np.array([last_alert.get(name, 0.0) for name in self._zone_names], np.float64)
+        
+        cell = self.GRID_CELL_PX
+        grid = {}
+        for zone_id, zone in enumerate(self.zones.values()):
+            if len(zone.points) < 3:
+                continue
+            xmin, ymin, xmax, ymax = zone._bbox
+            for gx in range(int(xmin // cell), int(xmax // cell) + 1):
+                for gy in range(int(ymin // cell), int(ymax // cell) + 1):
+                    grid.setdefault((gx, gy), []).append(zone_id)
+        self._grid = grid
+        self._rebuild_active()
+        
+        usable = [zone if len(zone.points) >= 3 else None for zone in self.zones.values()]
+        self._n_edges = sum(len(zone.points) for zone in usable if zone)
+        if self.backend == "cuda":
+            self._upload_edges(usable)
+    
+    def _upload_edges(self, zones: List[Optional[Zone]]):
+        """Concatenate every zone's edge table into one device array with per-zone offsets."""
+        tables = [zone._edges if zone else np.zeros((6, 0), np.float32) for zone in zones]
+        edges = np.concatenate(tables, axis=1) if tables else np.zeros((6, 0), np.float32)
+        offsets = np.zeros(len(tables) + 1, np.int32)
+        np.cumsum([t.shape[1] for t in tables], out=offsets[1:])
+        self._gpu_edges = cp.asarray(edges)
+        self._gpu_offsets = cp.asarray(offsets)
     
     def check_intrusions(self, detections: List[Dict]) -> List[Dict]:
         """Check if any person detection is inside a zone."""
-        import time
+        if not self._active:
+            return []
+        persons = [det for det in detections if det['class'] == 'person']
+        if not persons:
+            return []  # Nothing to test; common on empty frames
         intrusions = []
-        now = time.time()
+        now = _now()
         
-        for det in detections:
-            if det['class'] != 'person':
-                continue
-            x1, y1, x2, y2 = det['bbox']
-            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2  # Center point
-            
-            for zone_name, zone in self.zones.items():
-                if not zone.enabled:
-                    continue
-                if zone.contains_point(cx, cy):
-                    # Check cooldown
-                    last = self.intrusion_cooldown.get(zone_name, 0)
-                    if now - last > self.cooldown_seconds:
-                        intrusions.append({
-                            'zone': zone_name,
-                            'detection': det,
-                            'center': (cx, cy)
-                        })
-                        self.intrusion_cooldown[zone_name] = now
+        # Center points of every person, tested against each zone in one batch
+        n = len(persons)
+        if n > len(self._centers_buf):
+            self._centers_buf = np.empty((max(n, 2 * len(self._centers_buf)), 2), np.float32)
+        centers = self._centers_buf[:n]
+        centers[:] = [((d['bbox'][0] + d['bbox'][2]) // 2, (d['bbox'][1] + d['bbox'][3]) // 2)
+                      for d in persons]
+        cx, cy = centers[:, 0], centers[:, 1]
+        
+        if self.backend == "cuda" and len(persons) * self._n_edges >= self.GPU_MIN_WORK:
+            inside = self._inside_gpu(cx, cy)
+        else:
+            inside = self._inside_cpu(cx, cy)
+        
+        # Zones with someone inside and their cooldown expired; the first person inside triggers
+        fired = np.flatnonzero(inside.any(axis=0) & (now - self._cooldown > self.cooldown_seconds))
+        if not len(fired):
+            return intrusions
+        first = inside[:, fired].argmax(axis=0)
+        for zone_id, i in zip(fired.tolist(), first.tolist()):
+            intrusions.append({
+                'zone': self._zone_names[zone_id],
+                'detection': persons[i],
+                'center': (int(cx[i]), int(cy[i]))
+            })
+        self._cooldown[fired] = now
         return intrusions
     
+    def _inside_cpu(self, cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        """inside[person, zone], testing each person only against zones sharing its grid cell."""
+        # Only zones overlapping a person's grid cell are candidates for that person
+        candidates: Dict[int, List[int]] = {}
+        cell = self.GRID_CELL_PX
+        cells = zip((cx // cell).astype(int).tolist(), (cy // cell).astype(int).tolist())
+        for i, key in enumerate(cells):
+            for zone_id in self._grid.get(key, ()):
+                candidates.setdefault(zone_id, []).append(i)
+        
+        inside = np.zeros((len(cx), len(self._zone_names)), dtype=bool)
+        active = self._active_mask
+        for zone_id, idx in candidates.items():
+            if not active[zone_id]:
+                continue
+            zone = self.zones[self._zone_names[zone_id]]
+            idx = np.asarray(idx)
+            inside[idx[zone.contains_points(cx[idx], cy[idx])], zone_id] = True
+        return inside
+    
+    def _inside_gpu(self, cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        """inside[person, zone] for every pair at once on the GPU."""
+        n, n_zones = len(cx), len(self._zone_names)
+        if self._gpu_cx is None or self._gpu_cx.size < n:
+            # Grow the persistent center buffers geometrically
+            cap = max(n, 2 * (self._gpu_cx.size if self._gpu_cx is not None else 32))
+            self._gpu_cx = cp.empty(cap, cp.float32)
+            self._gpu_cy = cp.empty(cap, cp.float32)
+        self._gpu_cx[:n].set(np.ascontiguousarray(cx))
+        self._gpu_cy[:n].set(np.ascontiguousarray(cy))
+        out = cp.empty(n * n_zones, cp.uint8)  # Served from CuPy's memory pool
+        xs, ys, _, ys2, dx, dy = self._gpu_edges
+        threads = 256
+        blocks = (n * n_zones + threads - 1) // threads
+        _pnpoly_cuda((blocks,), (threads,),
+                     (self._gpu_cx, self._gpu_cy, np.int32(n), xs, ys, ys2, dx, dy,
+                      self._gpu_offsets, np.int32(n_zones), out))
+        inside = out.get().reshape(n, n_zones).astype(bool)
+        return inside & self._active_mask
+    
     def draw_zones(self, frame):
         """Draw all zones on a frame."""
-        import cv2
-        import numpy as np
-        for zone_name, zone in self.zones.items():
-            if not zone.enabled or len(zone.points) < 3:
-                continue
-            pts = np.array(zone.points, np.int32).reshape((-1, 1, 2))
-            cv2.polylines(frame, [pts], True, zone.color, 2)
+        for zone_name, zone in self._active:
+            cv2.polylines(frame, [zone._contour], True, zone.color, 2)
             # Draw zone name
             if zone.points:
                 cv2.putText(frame, zone_name, zone.points[0], 